@@ -0,0 +1,63 @@
+"""Compare the L1 hit rate of a ChainCache with and without TinyLFU admission.
+
+Run from the repository root with ``python -m benchmarks.bench_admission``.
+Each trace is replayed as Cached would: a read, and on a miss a write of the
+computed value.
+"""
+import bisect
+import itertools
+import random
+
+from cachetools import LRUCache
+
+from rediscache_cachetools.admission import TinyLFU
+from rediscache_cachetools.chain_cache import ChainCache
+
+L1_SIZE = 100
+KEYS = 10_000
+REQUESTS = 200_000
+
+
+def zipf_trace(n, keys=KEYS, s=1.0, seed=0):
+    rng = random.Random(seed)
+    cdf = list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, keys + 1)))
+    return [bisect.bisect(cdf, rng.random() * cdf[-1]) for _ in range(n)]
+
+
+def scan_trace(n, seed=0):
+    """Zipfian traffic interrupted by long scans over keys that are read only once."""
+    rng = random.Random(seed)
+    hot = zipf_trace(n, seed=seed)
+    trace, scanned = [], KEYS
+    for i, key in enumerate(hot):
+        trace.append(key)
+        if i % 1000 == 0:
+            length = rng.randint(200, 2000)
+            trace.extend(range(scanned, scanned + length))
+            scanned += length
+    return trace[:n]
+
+
+def l1_hit_rate(trace, admission):
+    l1 = LRUCache(maxsize=L1_SIZE)
+    chain = ChainCache(l1, LRUCache(maxsize=KEYS * 10), admission=admission)
+    hits = 0
+    for key in trace:
+        if key in l1:
+            hits += 1
+        try:
+            chain[key]
+        except KeyError:
+            chain[key] = key
+    return hits / len(trace)
+
+
+def main():
+    for name, trace in (("zipf", zipf_trace(REQUESTS)), ("scan", scan_trace(REQUESTS))):
+        lru = l1_hit_rate(trace, None)
+        tiny_lfu = l1_hit_rate(trace, TinyLFU(width=L1_SIZE * 16))
+        print(f"{name:>5}: LRU {lru:.3f}  TinyLFU {tiny_lfu:.3f}  ({tiny_lfu - lru:+.3f})")
+
+
+if __name__ == "__main__":
+    main()
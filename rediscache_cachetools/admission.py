@@ -0,0 +1,113 @@
+import threading
+from typing import Any, Hashable, MutableMapping
+
+from cachetools import LRUCache, TTLCache
+
+from .hot_keys import CountMinSketch, hash_indexes
+
+
+def default_victim(cache: MutableMapping) -> Any:
+    """Return the key a full cache evicts next.
+
+    cachetools has no public way to peek at it, so for LRUCache and TTLCache
+    this reads the recency order they keep privately and pop from; any other
+    cache yields its first key in iteration order.
+    """
+    if isinstance(cache, LRUCache):
+        order = getattr(cache, '_LRUCache__order', None)
+    elif isinstance(cache, TTLCache):
+        order = getattr(cache, '_TTLCache__links', None)
+    else:
+        order = None
+    return next(iter(order if order is not None else cache))
+
+
+class BloomFilter:
+    """A Bloom filter answering "possibly seen" or "definitely not seen".
+
+    :param size: Number of bits.
+    :param hashes: Number of bits set per key.
+    """
+
+    def __init__(self, size=8192, hashes=3):
+        self._size = size
+        self._hashes = hashes
+        self._bits = bytearray((size + 7) // 8)
+
+    def _indexes(self, key: Hashable):
+        return hash_indexes(key, self._hashes, self._size)
+
+    def add(self, key: Hashable) -> bool:
+        """Add a key, returning True if it was possibly present already."""
+        present = True
+        for index in self._indexes(key):
+            byte, bit = divmod(index, 8)
+            if not self._bits[byte] & (1 << bit):
+                present = False
+                self._bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, key: Hashable) -> bool:
+        return all(self._bits[index // 8] & (1 << (index % 8)) for index in self._indexes(key))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+
+class TinyLFU:
+    """A TinyLFU admission filter for the upper levels of a ChainCache.
+
+    Every access is recorded: the first occurrence of a key only sets its
+    doorkeeper Bloom filter bits, and later ones are counted in a Count-Min
+    sketch, so one-hit wonders never reach the sketch. A new key is admitted
+    into a full cache only if it is estimated to be more frequent than the
+    entry the cache would evict. Every ``sample_size`` records the counts are
+    halved and the doorkeeper reset, so frequencies follow recent traffic.
+
+    The would-be victim is found by ``victim(cache)``, default_victim unless
+    given.
+
+    :param width: Count-Min sketch width; a few times the upper cache's maxsize works well.
+    :param depth: Count-Min sketch depth.
+    :param sample_size: Records between two agings, defaulting to ``10 * width``.
+    :param victim: Optional callable returning the key a full cache evicts next.
+    """
+
+    def __init__(self, width=4096, depth=4, sample_size=None, victim=None):
+        self._sketch = CountMinSketch(width, depth)
+        self._doorkeeper = BloomFilter(size=width * 8)
+        self._sample_size = sample_size or 10 * width
+        self._victim = victim or default_victim
+        self._records = 0
+        self._lock = threading.Lock()
+
+    def record(self, key: Hashable) -> None:
+        """Record an access to a key."""
+        with self._lock:
+            if self._doorkeeper.add(key):
+                self._sketch.add(key)
+            self._records += 1
+            if self._records >= self._sample_size:
+                self._records = 0
+                self._sketch.halve()
+                self._doorkeeper.clear()
+
+    def frequency(self, key: Hashable) -> int:
+        """Return the estimated recent access count of a key."""
+        with self._lock:
+            return self._frequency(key)
+
+    def _frequency(self, key: Hashable) -> int:
+        return self._sketch.estimate(key) + (key in self._doorkeeper)
+
+    def admit(self, key: Any, cache: MutableMapping) -> bool:
+        """Decide whether a key may be inserted into a cache."""
+        maxsize = getattr(cache, 'maxsize', None)
+        if maxsize is None or getattr(cache, 'currsize', len(cache)) < maxsize or key in cache:
+            return True
+        try:
+            victim = self._victim(cache)
+        except StopIteration:
+            return True
+        with self._lock:
+            return self._frequency(key) > self._frequency(victim)
@@ -0,0 +1,156 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+import weakref
+
+log = logging.getLogger(__name__)
+
+_current_batch = contextvars.ContextVar("rediscache_cachetools_batch", default=None)
+_async_pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list]" = weakref.WeakKeyDictionary()
+
+
+class _Pending(concurrent.futures.Future):
+    """A Future that dispatches its batch when its result is needed before the batch ends."""
+
+    def __init__(self, batch):
+        super().__init__()
+        self._batch = batch
+
+    def result(self, timeout=None):
+        if not self.done():
+            self._batch.dispatch()
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        if not self.done():
+            self._batch.dispatch()
+        return super().exception(timeout)
+
+
+class CacheBatch:
+    """Coalesce lookups of Cached functions into one bulk lookup per cache.
+
+    Within ``with CacheBatch():``, ``func.load(*args)`` on a Cached-wrapped
+    function returns a Future instead of looking the key up. All pending
+    lookups are resolved together when the scope exits, or earlier as soon
+    as one of their results is requested: keys are fetched with a single
+    ``get_many`` per cache (an MGET for RedisCache), misses are computed and
+    written back with one ``set_many``.
+
+    Asyncio code needs no scope: ``await func.aload(*args)`` collects every
+    lookup issued during the same event loop iteration and resolves them in
+    the loop's default executor.
+    """
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.Lock()
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_current_batch.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.dispatch()
+        finally:
+            _current_batch.reset(self._tokens.pop())
+
+    def load(self, cached, func, *args, **kwargs) -> concurrent.futures.Future:
+        """Queue a lookup of ``func(*args, **kwargs)`` through a Cached instance."""
+        future = _Pending(self)
+        with self._lock:
+            self._pending.append((cached, func, cached.make_key(func, *args, **kwargs), args, kwargs, future))
+        return future
+
+    def dispatch(self) -> None:
+        """Resolve every queued lookup."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        _resolve(pending)
+
+
+def current_batch() -> CacheBatch | None:
+    """Return the innermost active CacheBatch, or None."""
+    return _current_batch.get()
+
+
+def load_async(cached, func, *args, **kwargs) -> asyncio.Future:
+    """Queue a lookup to be resolved with the others issued in this event loop iteration."""
+    loop = asyncio.get_running_loop()
+    pending = _async_pending.get(loop)
+    if pending is None:
+        pending = _async_pending[loop] = []
+        loop.call_soon(_dispatch_async, loop)
+    future = concurrent.futures.Future()
+    pending.append((cached, func, cached.make_key(func, *args, **kwargs), args, kwargs, future))
+    return asyncio.wrap_future(future, loop=loop)
+
+
+def _dispatch_async(loop) -> None:
+    pending = _async_pending.pop(loop)
+
+    def settle(dispatched):
+        # _resolve settles every future itself; this only covers a failure to run it at all.
+        error = dispatched.exception() if not dispatched.cancelled() else concurrent.futures.CancelledError()
+        for *_, future in pending:
+            if not future.done():
+                future.set_exception(error or RuntimeError("Batched lookup was not resolved."))
+
+    loop.run_in_executor(None, _resolve, pending).add_done_callback(settle)
+
+
+def _resolve(pending) -> None:
+    """Resolve ``(cached, func, key, args, kwargs, future)`` lookups, grouped by Cached instance.
+
+    Every future is settled, even if the lookup fails. A failed write-back is
+    logged, and callers still receive their computed values.
+    """
+    groups = {}
+    for item in pending:
+        groups.setdefault(id(item[0]), []).append(item)
+
+    for items in groups.values():
+        cached = items[0][0]
+        results, error = {}, None
+        try:
+            found = cached.get_many(list(dict.fromkeys(item[2] for item in items)))
+
+            computed, versions = {}, {}
+            for _, func, key, args, kwargs, future in items:
+                try:
+                    if key in found:
+                        value = found[key]
+                        if cached.info:
+                            cached.hits += 1
+                    elif key in computed:
+                        value = computed[key]
+                    else:
+                        if cached.info:
+                            cached.misses += 1
+                        versions[key] = time.time_ns()
+                        value = computed[key] = func(*args, **kwargs)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    results[future] = value
+
+            if computed:
+                try:
+                    cached.set_many(computed, versions)
+                except Exception as e:
+                    log.warning("Failed to write back %d batched entries", len(computed), exc_info=e)
+        except Exception as e:
+            error = e
+        finally:
+            for *_, future in items:
+                if future.done():
+                    continue
+                if future in results:
+                    future.set_result(results[future])
+                else:
+                    future.set_exception(error or RuntimeError("Batched lookup was not resolved."))
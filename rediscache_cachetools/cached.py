@@ -1,12 +1,34 @@
 import collections
+import concurrent.futures
 import contextlib
 import functools
+import itertools
+import logging
+import threading
+import time
+
+from .batching import CacheBatch, current_batch, load_async
+from .chain_cache import delete_prefix
+
+log = logging.getLogger(__name__)
 
 _CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
 
+def store_function(cache):
+    """Return ``(store, clock)`` used to write back values computed for a cache.
+
+    With a versioned cache, values are written with ``set_if_newer`` using
+    the time their computation started as version, so a computation that
+    finishes late cannot overwrite a fresher value.
+    """
+    if getattr(cache, 'versioned', False) is True:
+        return cache.set_if_newer, time.time_ns
+    return (lambda key, value, version: cache.__setitem__(key, value)), int
+
+
 class Cached:
-    def __init__(self, cache, key=None, lock=None, info=False, prefix=""):
+    def __init__(self, cache, key=None, lock=None, info=False, prefix="", max_workers=8):
         self.cache = cache
         self.key_function = key
         self.lock = lock
@@ -21,45 +43,210 @@ class Cached:
             self.hits = 0
             self.misses = 0
 
-        self.key_cache = {}
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
-    def make_key(self, func, *args, **kwargs):
-        """Generate a cache key using the cache's make_key method if available."""
+    def key_maker(self, func):
+        """Return a function of the call arguments generating func's cache keys.
+
+        The key source is resolved once: a ``cached_key`` attribute of func,
+        the cache's make_key method if available, the key function, or the
+        arguments.
+        """
+        prefix = self.prefix
 
         if hasattr(func, 'cached_key'):
-            return func.cached_key
+            cached_key = func.cached_key
+            return lambda *args, **kwargs: cached_key
 
         if hasattr(self.cache, 'make_key'):
-            return self.prefix + self.cache.make_key(func, *args, **kwargs)
+            cache_make_key = self.cache.make_key
+            return lambda *args, **kwargs: prefix + cache_make_key(func, *args, **kwargs)
         elif self.key_function:
-            return self.prefix + self.key_function(func, *args, **kwargs)
+            key_function = self.key_function
+            return lambda *args, **kwargs: prefix + key_function(func, *args, **kwargs)
         else:
-            return f"{self.prefix}{args}:{kwargs}"
+            return lambda *args, **kwargs: f"{prefix}{args}:{kwargs}"
 
-    def wrapper(self, func, *args, **kwargs):
-        cached_key = self.make_key(func, *args, **kwargs)
+    def make_key(self, func, *args, **kwargs):
+        """Generate a cache key using the cache's make_key method if available."""
+        return self.key_maker(func)(*args, **kwargs)
 
-        try:
-            with self.lock if self.lock else contextlib.nullcontext():
-                result = self.cache[cached_key]
-                if self.info:
-                    self.hits += 1
-                return result
-        except KeyError:
-            if self.info:
-                self.misses += 1
+    def miss_function(self, func):
+        """Return ``miss(key, args, kwargs)`` computing func's value for a missed key and storing it.
+
+        A value the cache cannot hold is returned without being stored.
+        """
+        lock = self.lock if self.lock else contextlib.nullcontext()
+        store, clock = store_function(self.cache)
+
+        def miss(key, args, kwargs):
+            version = clock()
             result = func(*args, **kwargs)
             try:
-                with self.lock if self.lock else contextlib.nullcontext():
-                    self.cache[cached_key] = result
+                with lock:
+                    store(key, result, version)
             except ValueError:
                 pass  # value too large
             return result
 
-    def __call__(self, func):
+        return miss
+
+    def wrapper(self, func, *args, **kwargs):
+        """Call func through the cache once; decorating func avoids specializing it on every call."""
+        return self.specialize(func)(*args, **kwargs)
+
+    def get_many(self, keys):
+        """Look up several keys, in one round trip if the cache supports get_many."""
+        with self.lock if self.lock else contextlib.nullcontext():
+            if hasattr(self.cache, 'get_many'):
+                return self.cache.get_many(keys)
+            found = {}
+            for key in keys:
+                try:
+                    found[key] = self.cache[key]
+                except KeyError:
+                    continue
+            return found
+
+    def set_many(self, mapping, versions=None):
+        """Store several entries, in one round trip if the cache supports set_many.
+
+        ``versions`` maps keys to the time their computation started; a
+        versioned cache only accepts an entry newer than the one it holds.
+        """
+        versioned = getattr(self.cache, 'versioned', False) is True
+        try:
+            with self.lock if self.lock else contextlib.nullcontext():
+                if hasattr(self.cache, 'set_many'):
+                    if versioned:
+                        self.cache.set_many(mapping, versions=versions)
+                    else:
+                        self.cache.set_many(mapping)
+                elif versioned:
+                    for key, value in mapping.items():
+                        self.cache.set_if_newer(key, value, (versions or {}).get(key))
+                else:
+                    for key, value in mapping.items():
+                        self.cache[key] = value
+        except ValueError:
+            pass  # value too large
+
+    def warm(self, func, iterable_of_args, max_workers=None, batch_size=100):
+        """Compute and store the entries missing for each argument tuple.
+
+        Each item of ``iterable_of_args`` is a tuple of positional arguments; any
+        other item is passed as the single argument. Keys already cached are
+        skipped with a bulk lookup, missing values are computed on a bounded
+        thread pool and written back one batch at a time. An argument tuple whose
+        computation raises is logged and skipped.
+
+        :return: The number of entries computed.
+        """
+        computed = 0
+        items = iter(iterable_of_args)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            while batch := list(itertools.islice(items, batch_size)):
+                calls = {}
+                for args in batch:
+                    args = args if isinstance(args, tuple) else (args,)
+                    calls[self.make_key(func, *args)] = args
+                present = self.get_many(list(calls))
+                missing = [key for key in calls if key not in present]
+                versions, futures = {}, {}
+                for key in missing:
+                    versions[key] = time.time_ns()
+                    futures[key] = executor.submit(func, *calls[key])
+                results = {}
+                for key, future in futures.items():
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        log.warning("Failed to warm %s", key, exc_info=e)
+                self.set_many(results, versions)
+                computed += len(results)
+        return computed
+
+    def prefetch(self, func, *args, **kwargs):
+        """Compute and cache one entry in the background, returning a Future of its value."""
+        return self._submit(self.specialize(func), *args, **kwargs)
+
+    def _submit(self, wrapped_func, *args, **kwargs):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="cached-prefetch")
+        return self._executor.submit(wrapped_func, *args, **kwargs)
+
+    def load(self, func, *args, **kwargs) -> concurrent.futures.Future:
+        """Return a Future of the cached value, batched with the other loads of the current CacheBatch."""
+        batch = current_batch()
+        if batch is None:
+            batch = CacheBatch()
+            future = batch.load(self, func, *args, **kwargs)
+            batch.dispatch()
+            return future
+        return batch.load(self, func, *args, **kwargs)
+
+    async def aload(self, func, *args, **kwargs):
+        """Return the cached value, batched with the loads issued in the same event loop iteration."""
+        return await load_async(self, func, *args, **kwargs)
+
+    def specialize(self, func):
+        """Return func wrapped with the cache lookup, specialized for the lock and info settings.
 
-        def wrapped_func(*args, **kwargs):
-            return self.wrapper(func, *args, **kwargs)
+        A hit costs one key call and one lookup, as with cachetools.cached.
+        """
+        cache = self.cache
+        lock = self.lock
+        make_key = self.key_maker(func)
+        miss = self.miss_function(func)
+
+        if lock is None and not self.info:
+            def wrapped_func(*args, **kwargs):
+                key = make_key(*args, **kwargs)
+                try:
+                    return cache[key]
+                except KeyError:
+                    pass  # key not found
+                return miss(key, args, kwargs)
+        elif lock is None:
+            def wrapped_func(*args, **kwargs):
+                key = make_key(*args, **kwargs)
+                try:
+                    result = cache[key]
+                    self.hits += 1
+                    return result
+                except KeyError:
+                    self.misses += 1
+                return miss(key, args, kwargs)
+        elif not self.info:
+            def wrapped_func(*args, **kwargs):
+                key = make_key(*args, **kwargs)
+                try:
+                    with lock:
+                        return cache[key]
+                except KeyError:
+                    pass  # key not found
+                return miss(key, args, kwargs)
+        else:
+            def wrapped_func(*args, **kwargs):
+                key = make_key(*args, **kwargs)
+                try:
+                    with lock:
+                        result = cache[key]
+                        self.hits += 1
+                    return result
+                except KeyError:
+                    with lock:
+                        self.misses += 1
+                return miss(key, args, kwargs)
+
+        return wrapped_func
+
+    def __call__(self, func):
+        wrapped_func = self.specialize(func)
 
         if self.info:
             wrapped_func.cache_info = self.get_cache_info
@@ -68,6 +255,10 @@ class Cached:
             wrapped_func.cache_info = None
             wrapped_func.cache_clear = lambda: None
 
+        wrapped_func.warm = functools.partial(self.warm, func)
+        wrapped_func.prefetch = functools.partial(self._submit, wrapped_func)
+        wrapped_func.load = functools.partial(self.load, func)
+        wrapped_func.aload = functools.partial(self.aload, func)
         wrapped_func.cache = self.cache
         wrapped_func.cache_key = self.key_function
         wrapped_func.cache_lock = self.lock
@@ -82,6 +273,89 @@ class Cached:
 
     def cache_clear(self):
         self.cache.clear()
-        self.key_cache.clear()
         if self.info:
             self.hits = self.misses = 0
+
+
+class CachedMethod:
+    """Memoize a method, resolving the cache and lock from the instance.
+
+    Like ``cachetools.cachedmethod``, ``cache`` and ``lock`` are called with the
+    instance (``lambda self: self.cache``); a cache object may also be given
+    directly. Keys do not embed ``repr(self)``: each instance gets the
+    namespace ``<prefix><module>.<class>:<identity>:``, where the identity is
+    read from the ``identity`` attribute (or computed by a callable), so
+    equal objects share entries across processes and restarts. All entries
+    of one instance are removed with ``method.cache_clear(instance)``.
+
+    :param cache: A cache, or a callable returning the cache for an instance.
+    :param key: Optional ``key(func, *args, **kwargs)`` building the part of the key after the namespace.
+    :param lock: Optional callable returning the lock for an instance.
+    :param identity: Name of the instance attribute identifying it, or a callable of the instance.
+    :param prefix: Optional prefix to add to all keys.
+    """
+
+    def __init__(self, cache, key=None, lock=None, identity="id", prefix=""):
+        self.cache = cache
+        self.key_function = key
+        self.lock = lock
+        self.identity = identity
+        self.prefix = prefix if not prefix or prefix.endswith(":") else prefix + ":"
+
+    def get_cache(self, instance):
+        return self.cache(instance) if callable(self.cache) else self.cache
+
+    def get_lock(self, instance):
+        return self.lock(instance) if self.lock else contextlib.nullcontext()
+
+    def namespace(self, instance) -> str:
+        """Return the key prefix shared by all entries of an instance."""
+        cls = type(instance)
+        identity = self.identity(instance) if callable(self.identity) else getattr(instance, self.identity)
+        return f"{self.prefix}{cls.__module__}.{cls.__qualname__}:{identity}:"
+
+    def make_key(self, func, instance, *args, **kwargs) -> str:
+        if self.key_function:
+            return self.namespace(instance) + self.key_function(func, *args, **kwargs)
+        return f"{self.namespace(instance)}{func.__name__}:{args}:{kwargs}"
+
+    def wrapper(self, func, instance, *args, **kwargs):
+        cache = self.get_cache(instance)
+        cached_key = self.make_key(func, instance, *args, **kwargs)
+
+        try:
+            with self.get_lock(instance):
+                return cache[cached_key]
+        except KeyError:
+            store, clock = store_function(cache)
+            version = clock()
+            result = func(instance, *args, **kwargs)
+            try:
+                with self.get_lock(instance):
+                    store(cached_key, result, version)
+            except ValueError:
+                pass  # value too large
+            return result
+
+    def cache_clear(self, instance):
+        """Remove every cached entry of an instance, across all its memoized methods.
+
+        Caches with a ``delete_prefix`` method, such as RedisCache and every
+        level of a ChainCache, delete the namespace themselves; other caches
+        are scanned for keys in it.
+        """
+        with self.get_lock(instance):
+            delete_prefix(self.get_cache(instance), self.namespace(instance))
+
+    def __call__(self, func):
+
+        def wrapped_method(instance, *args, **kwargs):
+            return self.wrapper(func, instance, *args, **kwargs)
+
+        wrapped_method.cache_clear = self.cache_clear
+        wrapped_method.cache_namespace = self.namespace
+        wrapped_method.cache = self.cache
+        wrapped_method.cache_key = self.key_function
+        wrapped_method.cache_lock = self.lock
+
+        return functools.update_wrapper(wrapped_method, func)
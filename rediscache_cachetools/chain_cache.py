@@ -1,31 +1,69 @@
 import logging
+import time
 from typing import Any, MutableMapping
 
+from .hot_keys import HotKeys
+
 log = logging.getLogger(__name__)
 
 
+def delete_prefix(cache: MutableMapping, prefix: str) -> None:
+    """Delete every string key starting with ``prefix``, using the cache's own delete_prefix if it has one."""
+    if hasattr(cache, 'delete_prefix'):
+        cache.delete_prefix(prefix)  # type: ignore
+        return
+    for key in [key for key in cache if isinstance(key, str) and key.startswith(prefix)]:
+        try:
+            del cache[key]
+        except KeyError:
+            continue
+
+
 class ChainCache(MutableMapping):
     """A multi-level cache chain that tries multiple caches in order.
 
     :param caches: A list of caches ordered by priority.
     :param resilient: If True, will ignore exceptions from lower-level caches.
+    :param hot_keys: Optional HotKeys tracker; reads of hot keys are served from its short-lived local copies.
+    :param admission: Optional admission filter, such as TinyLFU, deciding whether promotions and writes
+        enter the upper levels; it provides ``record(key)`` and ``admit(key, cache)``. The last level
+        always receives writes.
     """
 
-    def __init__(self, *caches: MutableMapping, resilient: bool = False):
+    def __init__(self, *caches: MutableMapping, resilient: bool = False, hot_keys: HotKeys | None = None,
+                 admission: Any = None):
         if len(caches) < 2:
             raise ValueError("CacheChain requires at least two cache levels.")
         self._caches = caches
         self._resilient = resilient
+        self._hot_keys = hot_keys
+        self._admission = admission
 
     def __getitem__(self, key: Any) -> Any:
         last_exception = None
 
+        if self._hot_keys is not None:
+            self._hot_keys.record(key)
+            try:
+                return self._hot_keys.get(key)
+            except KeyError:
+                pass
+
+        if self._admission is not None:
+            self._admission.record(key)
+
         for i, cache in enumerate(self._caches):
             try:
-                value = cache[key]
+                if getattr(cache, 'versioned', False) is True:
+                    value, version = cache.get_versioned(key)
+                else:
+                    value, version = cache[key], None
                 # Promote item to higher-level caches if found in a lower-level cache
                 for j in range(i):
-                    self._caches[j][key] = value
+                    if self._admits(key, self._caches[j]):
+                        self._store_upper(self._caches[j], key, value, version)
+                if self._hot_keys is not None:
+                    self._hot_keys.promote(key, value)
                 return value
             except KeyError:
                 continue
@@ -42,10 +80,15 @@ class ChainCache(MutableMapping):
 
     def __setitem__(self, key: Any, value: Any) -> None:
         last_exception = None
+        if self._hot_keys is not None:
+            self._hot_keys.discard(key)
 
         for cache in self._caches:
             try:
-                cache[key] = value
+                if cache is self._caches[-1]:
+                    cache[key] = value
+                elif self._admits(key, cache):
+                    self._store_upper(cache, key, value, None)
             except Exception as e:
                 if self._resilient:
                     log.debug(e, exc_info=True)
@@ -56,8 +99,71 @@ class ChainCache(MutableMapping):
         if last_exception:
             raise last_exception
 
+    def _admits(self, key: Any, cache: MutableMapping) -> bool:
+        return self._admission is None or self._admission.admit(key, cache)
+
+    @staticmethod
+    def _store(cache: MutableMapping, key: Any, value: Any, version: int | None) -> bool:
+        """Write to one level, conditionally on the version if the level is versioned."""
+        if version is not None and getattr(cache, 'versioned', False) is True:
+            return cache.set_if_newer(key, value, version)  # type: ignore
+        cache[key] = value
+        return True
+
+    def _store_upper(self, cache: MutableMapping, key: Any, value: Any, version: int | None) -> bool:
+        """Write to an upper level, skipping it if it cannot hold the value, such as one too large for it.
+
+        A skipped level drops any older entry of the key, so reads fall through to the lower levels.
+        """
+        try:
+            return self._store(cache, key, value, version)
+        except ValueError as e:
+            log.debug(e, exc_info=True)
+            cache.pop(key, None)
+            return True
+
+    @property
+    def versioned(self) -> bool:
+        """True if any level stores versioned entries."""
+        return any(getattr(cache, 'versioned', False) is True for cache in self._caches)
+
+    def set_if_newer(self, key: Any, value: Any, version: int | None = None) -> bool:
+        """Set a value in every level unless a versioned level holds a newer entry.
+
+        Levels are written from the last one up. Once a versioned level rejects
+        the value, the key is removed from the levels above it instead, so they
+        fall through to the newer entry. Returns True if every level accepted it.
+        """
+        last_exception = None
+        if self._hot_keys is not None:
+            self._hot_keys.discard(key)
+        if version is None:
+            version = time.time_ns()
+
+        accepted = True
+        for cache in reversed(self._caches):
+            try:
+                if not accepted:
+                    cache.pop(key, None)
+                elif cache is self._caches[-1]:
+                    accepted = self._store(cache, key, value, version)
+                elif self._admits(key, cache):
+                    accepted = self._store_upper(cache, key, value, version)
+            except Exception as e:
+                if self._resilient:
+                    log.debug(e, exc_info=True)
+                    last_exception = e
+                else:
+                    raise
+
+        if last_exception:
+            raise last_exception
+        return accepted
+
     def __delitem__(self, key: Any) -> None:
         last_exception = None
+        if self._hot_keys is not None:
+            self._hot_keys.discard(key)
 
         for cache in self._caches:
             try:
@@ -83,6 +189,27 @@ class ChainCache(MutableMapping):
     def clear(self) -> None:
         for cache in self._caches:
             cache.clear()
+        if self._hot_keys is not None:
+            self._hot_keys.clear()
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Delete every string key starting with ``prefix`` from all levels."""
+        last_exception = None
+        if self._hot_keys is not None:
+            self._hot_keys.discard_prefix(prefix)
+
+        for cache in self._caches:
+            try:
+                delete_prefix(cache, prefix)
+            except Exception as e:
+                if self._resilient:
+                    log.debug(e, exc_info=True)
+                    last_exception = e
+                else:
+                    raise
+
+        if last_exception:
+            raise last_exception
 
     def stats(self) -> dict[str, Any]:
         """Return statistics for each cache level."""
@@ -93,6 +220,8 @@ class ChainCache(MutableMapping):
             except Exception as e:
                 log.debug(e, exc_info=True)
                 data[f"cache{i + 1}"] = {}  # type: ignore
+        if self._hot_keys is not None:
+            data["hot_keys"] = self._hot_keys.stats()  # type: ignore
         return data
 
     def hits(self) -> float | None:
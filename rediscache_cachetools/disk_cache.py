@@ -0,0 +1,159 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, MutableMapping
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key BLOB PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires);
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+"""
+
+
+class SQLiteCache(MutableMapping):
+    """A persistent on-disk cache backed by SQLite in WAL mode.
+
+    Entries survive restarts, so a ChainCache with this tier between the
+    in-memory cache and RedisCache comes up warm. Expired entries are never
+    returned and are purged lazily; when ``maxsize`` is exceeded the least
+    recently accessed entries are evicted. The size bound is enforced every
+    ``maxsize // 100`` writes, so the table may briefly exceed it by 1%.
+
+    :param path: Database file path.
+    :param ttl: Default time-to-live for cache entries in seconds.
+    :param maxsize: Maximum number of entries kept, or None for unbounded.
+    :param touch: If True, reads refresh the access time used for eviction.
+    :param touch_interval: Seconds an access time must be old before a read refreshes it. Refreshing
+        is a write that takes the database lock, so this keeps hits from serializing on it.
+    """
+
+    def __init__(self, path=None, ttl=3600, maxsize=100_000, touch=True, touch_interval=60):
+        self._path = path or os.path.join(tempfile.gettempdir(), "rediscache-cachetools.sqlite")
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._touch = touch
+        self._touch_interval = touch_interval
+        self._local = threading.local()
+        self._writes = 0
+        self._connection().executescript(_SCHEMA)
+        self.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use.
+
+        SQLite connections must not be used across fork(), so a process that
+        inherited one, such as a pre-forked worker, opens its own.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            self._release(conn)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _make_key(key: Any) -> bytes:
+        """Pickle a key so that any hashable key can be stored."""
+        return pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __getitem__(self, key: Any) -> Any:
+        """Retrieve a value from the cache."""
+        now = time.time()
+        conn = self._connection()
+        full_key = self._make_key(key)
+        row = conn.execute(
+            "SELECT value, accessed FROM cache WHERE key = ? AND expires > ?", (full_key, now)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        if self._touch and now - row[1] >= self._touch_interval:
+            conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, full_key))
+        return pickle.loads(row[0])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a value in the cache with the default TTL."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+            (self._make_key(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + self._ttl, now),
+        )
+        if self._maxsize is not None:
+            # Counting rows is a table scan, so the bound is checked every 1% of maxsize writes.
+            self._writes += 1
+            if self._writes >= max(1, self._maxsize // 100):
+                self._writes = 0
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Purge expired entries, then the least recently accessed ones beyond maxsize."""
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count <= self._maxsize:
+            return
+        conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT "
+            "max(0, (SELECT COUNT(*) FROM cache) - ?))",
+            (self._maxsize,),
+        )
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a value from the cache."""
+        cursor = self._connection().execute(
+            "DELETE FROM cache WHERE key = ? RETURNING expires", (self._make_key(key),)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        if row is None or row[0] <= time.time():
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        """Return the number of unexpired entries."""
+        return self._connection().execute("SELECT COUNT(*) FROM cache WHERE expires > ?", (time.time(),)).fetchone()[0]
+
+    def __iter__(self):
+        """Iterate over unexpired cache keys."""
+        rows = self._connection().execute("SELECT key FROM cache WHERE expires > ?", (time.time(),)).fetchall()
+        for row in rows:
+            yield pickle.loads(row[0])
+
+    def clear(self) -> None:
+        """Clear all items in the cache."""
+        self._connection().execute("DELETE FROM cache")
+
+    def expire(self) -> int:
+        """Remove expired entries and return how many were removed."""
+        return self._connection().execute("DELETE FROM cache WHERE expires <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Return statistics about the disk cache."""
+        return {
+            'keys': len(self),
+            'maxsize': self._maxsize,
+        }
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        self._release(getattr(self._local, "conn", None))
+        self._local.conn = None
+
+    def _release(self, conn: sqlite3.Connection | None) -> None:
+        if conn is None:
+            return
+        if self._local.pid == os.getpid():
+            conn.close()
+        else:
+            # A connection inherited through fork() is kept referenced rather than closed: closing
+            # it may checkpoint and remove the WAL file that the parent still uses.
+            self._local.inherited = conn
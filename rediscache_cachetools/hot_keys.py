@@ -0,0 +1,164 @@
+import threading
+from array import array
+from typing import Any, Hashable
+
+from cachetools import TTLCache
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def hash_indexes(key: Hashable, count: int, size: int) -> list[int]:
+    """Return ``count`` indexes below ``size`` for a key by double hashing.
+
+    hash() of a small int is the int itself, so it is mixed with splitmix64
+    first; otherwise the derived indexes of nearby keys would collide
+    together in every row.
+    """
+    z = (hash(key) + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    z ^= z >> 31
+    h, step = z & 0xFFFFFFFF, (z >> 32) | 1
+    return [(h + i * step) % size for i in range(count)]
+
+
+class CountMinSketch:
+    """A Count-Min sketch estimating key frequencies in fixed memory.
+
+    Estimates never undercount; they overcount by at most ``total / width``
+    with probability ``1 - 2 ** -depth``. Counters saturate instead of
+    wrapping, and ``halve()`` ages them so old traffic fades out.
+
+    :param width: Number of counters per row.
+    :param depth: Number of rows, each indexed by an independent hash.
+    """
+
+    _MAX = 0xFFFFFFFF
+
+    def __init__(self, width=2048, depth=4):
+        self._width = width
+        self._depth = depth
+        self._rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+
+    def _indexes(self, key: Hashable):
+        return hash_indexes(key, self._depth, self._width)
+
+    def add(self, key: Hashable) -> int:
+        """Count one occurrence of a key and return its new estimate."""
+        estimate = self._MAX
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self._MAX:
+                row[index] += 1
+            estimate = min(estimate, row[index])
+        return estimate
+
+    def estimate(self, key: Hashable) -> int:
+        """Return the estimated number of occurrences of a key."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def halve(self) -> None:
+        """Divide every counter by two."""
+        for i, row in enumerate(self._rows):
+            self._rows[i] = array('I', (count >> 1 for count in row))
+
+    def clear(self) -> None:
+        """Reset every counter to zero."""
+        for i in range(self._depth):
+            self._rows[i] = array('I', bytes(4 * self._width))
+
+
+class HotKeys:
+    """Detect heavily read keys and keep short-lived local copies of them.
+
+    Every read is counted in a Count-Min sketch; keys whose estimate reaches
+    ``threshold`` join a top-K heavy-hitters table, and values read for those
+    keys are kept in an in-process TTL cache so repeated reads skip the
+    backend. Counts are halved every ``sample_size`` reads so keys that
+    cool down leave the table.
+
+    :param threshold: Estimated reads within the current sample for a key to be hot.
+    :param top_k: Maximum number of hot keys tracked and replicated.
+    :param ttl: Time-to-live of local copies in seconds; bounds how stale they may be.
+    :param sample_size: Reads between two agings of the counts.
+    :param width: Count-Min sketch width.
+    :param depth: Count-Min sketch depth.
+    """
+
+    def __init__(self, threshold=100, top_k=32, ttl=1.0, sample_size=100_000, width=2048, depth=4):
+        self._threshold = threshold
+        self._top_k = top_k
+        self._sample_size = sample_size
+        self._sketch = CountMinSketch(width, depth)
+        self._top: dict[Hashable, int] = {}
+        self._replica = TTLCache(maxsize=top_k, ttl=ttl)
+        self._reads = 0
+        self._replica_hits = 0
+        self._lock = threading.Lock()
+
+    def record(self, key: Hashable) -> None:
+        """Count a read of a key, updating the heavy-hitters table."""
+        with self._lock:
+            count = self._sketch.add(key)
+            if key in self._top or count >= self._threshold:
+                self._top[key] = count
+                if len(self._top) > self._top_k:
+                    coldest = min(self._top, key=self._top.__getitem__)
+                    del self._top[coldest]
+                    self._replica.pop(coldest, None)
+
+            self._reads += 1
+            if self._reads >= self._sample_size:
+                self._age()
+
+    def _age(self) -> None:
+        self._reads = 0
+        self._sketch.halve()
+        for key in list(self._top):
+            self._top[key] >>= 1
+            if self._top[key] < self._threshold:
+                del self._top[key]
+                self._replica.pop(key, None)
+
+    def is_hot(self, key: Hashable) -> bool:
+        return key in self._top
+
+    def get(self, key: Hashable) -> Any:
+        """Return the local copy of a hot key, raising KeyError if there is none."""
+        with self._lock:
+            value = self._replica[key]
+            self._replica_hits += 1
+            return value
+
+    def promote(self, key: Hashable, value: Any) -> None:
+        """Keep a local copy of a value read from the backend if its key is hot."""
+        with self._lock:
+            if key in self._top:
+                self._replica[key] = value
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the local copy of a key after it was written or deleted."""
+        with self._lock:
+            self._replica.pop(key, None)
+
+    def discard_prefix(self, prefix: str) -> None:
+        """Drop the local copies of every string key starting with ``prefix``."""
+        with self._lock:
+            for key in [key for key in self._replica if isinstance(key, str) and key.startswith(prefix)]:
+                self._replica.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all counts and local copies."""
+        with self._lock:
+            self._sketch.clear()
+            self._top.clear()
+            self._replica.clear()
+            self._reads = self._replica_hits = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the hot keys with their estimated counts, hottest first."""
+        with self._lock:
+            return {
+                'hot_keys': sorted(self._top.items(), key=lambda item: item[1], reverse=True),
+                'replicated': len(self._replica),
+                'replica_hits': self._replica_hits,
+            }
@@ -1,9 +1,53 @@
 import base64
+import itertools
 import json
+import logging
+import re
+import time
 from inspect import stack, getmodule
 from typing import Any, MutableMapping
 
 import redis
+import redis.sentinel
+
+log = logging.getLogger(__name__)
+
+# Versioned entries are stored as "<20-digit version>|<value>", tombstones as "<version>!".
+# Fixed-width versions compare correctly as strings, which Lua does without losing precision.
+_VERSIONED = re.compile(r"(\d{20})([|!])")
+
+_SET_IF_NEWER = """
+-- Versions exceed the precision of Lua numbers, so they are incremented digit by digit.
+local function increment(version)
+    local i = #version
+    while string.sub(version, i, i) == '9' do
+        i = i - 1
+    end
+    if i == 0 then
+        return version
+    end
+    return string.sub(version, 1, i - 1) .. (tonumber(string.sub(version, i, i)) + 1) .. string.rep('0', #version - i)
+end
+
+local current = redis.call('GET', KEYS[1])
+local value = ARGV[2]
+local live = 0
+if current then
+    local version, kind = string.match(current, '^(%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d%d)([|!])')
+    if kind ~= '!' then
+        live = 1
+    end
+    if version and version >= ARGV[1] then
+        if ARGV[4] ~= 'delete' then
+            return {0, live}
+        end
+        -- A delete always wins: its tombstone takes the version after the stored one.
+        value = increment(version) .. '!'
+    end
+end
+redis.call('SET', KEYS[1], value, 'PX', ARGV[3])
+return {1, live}
+"""
 
 
 class RedisCache(MutableMapping):
@@ -14,10 +58,47 @@ class RedisCache(MutableMapping):
     :param db: Redis database number.
     :param ttl: Default time-to-live for cache entries in seconds.
     :param prefix: Optional prefix to add to all keys.
+    :param replicas: Optional list of ``(host, port)`` read replicas; reads go to them, writes to the primary.
+    :param sentinel: Optional list of ``(host, port)`` Sentinel addresses, replacing host and port.
+    :param service_name: Name of the Sentinel-monitored primary.
+    :param read_strategy: ``"round_robin"`` or ``"least_latency"`` replica selection.
+    :param retry_interval: Seconds a failed replica is skipped before being tried again.
+    :param probe_interval: With ``"least_latency"``, every this many reads go to the next replica in turn
+        and reset its latency estimate, so a replica that recovers from a slow spell gets traffic again.
+    :param hot_keys: Optional HotKeys tracker; reads of hot keys are served from its short-lived local copies.
+    :param scan_count: COUNT hint of the SCAN calls used to iterate the cache.
+    :param versioned: If True, entries carry a version and writes only replace older versions, atomically.
+    :param tombstone_ttl: Seconds a versioned delete blocks writes of versions older than the delete.
     """
 
-    def __init__(self, host='localhost', port=6379, db=0, ttl=600, prefix=""):
-        self._redis = redis.StrictRedis(host=host, port=port, db=db, decode_responses=True)
+    def __init__(self, host='localhost', port=6379, db=0, ttl=600, prefix="", replicas=None, sentinel=None,
+                 service_name="mymaster", read_strategy="round_robin", retry_interval=5.0, probe_interval=100,
+                 hot_keys=None, scan_count=1000, versioned=False, tombstone_ttl=60):
+        if read_strategy not in ("round_robin", "least_latency"):
+            raise ValueError(f"Unknown read strategy: {read_strategy}")
+        if probe_interval < 1:
+            raise ValueError(f"probe_interval must be at least 1, not {probe_interval}")
+        if sentinel:
+            sentinels = redis.sentinel.Sentinel(sentinel, decode_responses=True)
+            self._redis = sentinels.master_for(service_name, db=db, decode_responses=True)
+            # The replica pool rotates over the replicas Sentinel reports and falls back to the primary itself.
+            self._replicas = [sentinels.slave_for(service_name, db=db, decode_responses=True)]
+        else:
+            self._redis = redis.StrictRedis(host=host, port=port, db=db, decode_responses=True)
+            self._replicas = [redis.StrictRedis(host=replica_host, port=replica_port, db=db, decode_responses=True)
+                              for replica_host, replica_port in replicas or ()]
+        self._read_strategy = read_strategy
+        self._retry_interval = retry_interval
+        self._probe_interval = probe_interval
+        self._round_robin = itertools.count()
+        self._probes = itertools.count()
+        self._latencies = [0.0] * len(self._replicas)
+        self._down_until = [0.0] * len(self._replicas)
+        self._hot_keys = hot_keys
+        self._scan_count = scan_count
+        self._versioned = versioned
+        self._tombstone_ttl = tombstone_ttl
+        self._set_if_newer = self._redis.register_script(_SET_IF_NEWER) if versioned else None
         self._ttl = ttl
         self._prefix = prefix
         self._function_path = self._get_calling_function_path()  # Initialize once
@@ -48,6 +129,15 @@ class RedisCache(MutableMapping):
             # Assume raw value, returning as string
             return value
 
+    def _load(self, value: str) -> tuple[Any, int | None] | None:
+        """Deserialize a stored value into ``(value, version)``, or None for a tombstone."""
+        match = _VERSIONED.match(value) if self._versioned else None
+        if match is None:
+            return self._deserialize(value), None
+        if match.group(2) == "!":
+            return None
+        return self._deserialize(value[match.end():]), int(match.group(1))
+
     @staticmethod
     def _get_calling_function_path() -> str:
         """Get the calling function's module and name."""
@@ -61,6 +151,39 @@ class RedisCache(MutableMapping):
         # full_key = f"{self._prefix}{self._function_path}:{key}"
         return f"{self._prefix}{func.__module__}.{func.__qualname__}:{args}:{kwargs}"
 
+    def _select_replica(self) -> tuple[int | None, bool]:
+        """Pick a healthy replica to read from, or None to read from the primary.
+
+        Returns the replica index and whether the read is a latency probe.
+        """
+        now = time.monotonic()
+        healthy = [i for i, until in enumerate(self._down_until) if until <= now]
+        if not healthy:
+            return None, False
+        if self._read_strategy == "least_latency":
+            if (next(self._round_robin) + 1) % self._probe_interval:
+                return min(healthy, key=self._latencies.__getitem__), False
+            return healthy[next(self._probes) % len(healthy)], True
+        return healthy[next(self._round_robin) % len(healthy)], False
+
+    def _read(self, command: str, *args) -> Any:
+        """Run a read command on a replica, falling back to the primary if it fails."""
+        index, probe = self._select_replica()
+        if index is not None:
+            start = time.monotonic()
+            try:
+                result = getattr(self._replicas[index], command)(*args)
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
+                log.debug(e, exc_info=True)
+                self._down_until[index] = time.monotonic() + self._retry_interval
+            else:
+                # Exponentially weighted moving average of the replica's round trip time; a probe
+                # replaces it, so one slow spell cannot keep a replica out of rotation.
+                elapsed = time.monotonic() - start
+                self._latencies[index] = elapsed if probe else 0.8 * self._latencies[index] + 0.2 * elapsed
+                return result
+        return getattr(self._redis, command)(*args)
+
     @staticmethod
     def _make_key(key):
         """Generate a unique key with prefix."""
@@ -71,43 +194,204 @@ class RedisCache(MutableMapping):
     def __getitem__(self, key: Any) -> Any:
         """Retrieve a value from the cache."""
         full_key = self._make_key(key)
-        value = self._redis.get(full_key)
-        if value is None:
+        if self._hot_keys is not None:
+            self._hot_keys.record(full_key)
+            try:
+                return self._hot_keys.get(full_key)
+            except KeyError:
+                pass
+        value = self._read('get', full_key)
+        loaded = self._load(value) if value is not None else None
+        if loaded is None:
             raise KeyError(key)
-        return self._deserialize(value)
+        value = loaded[0]
+        if self._hot_keys is not None:
+            self._hot_keys.promote(full_key, value)
+        return value
 
     def __setitem__(self, key: Any, value: Any) -> None:
         """Set a value in the cache with an optional TTL."""
+        if self._versioned:
+            self.set_if_newer(key, value)
+            return
         full_key = self._make_key(key)
         self._redis.setex(full_key, self._ttl, self._serialize(value))
+        if self._hot_keys is not None:
+            self._hot_keys.discard(full_key)
 
     def __delitem__(self, key: Any) -> None:
         """Delete a value from the cache."""
         full_key = self._make_key(key)
-        if not self._redis.delete(full_key):
+        if self._hot_keys is not None:
+            self._hot_keys.discard(full_key)
+        if self._versioned:
+            # Leave a tombstone so that a computation started before the delete cannot write back. It is
+            # written even over a newer version, from a writer with a clock ahead of ours, and supersedes it.
+            version = f"{time.time_ns():020d}"
+            tombstone = [version, f"{version}!", int(self._tombstone_ttl * 1000), "delete"]
+            _, live = self._set_if_newer(keys=[full_key], args=tombstone)
+            if not live:
+                raise KeyError(key)
+        elif not self._redis.delete(full_key):
             raise KeyError(key)
 
+    @property
+    def versioned(self) -> bool:
+        return self._versioned
+
+    def set_if_newer(self, key: Any, value: Any, version: int | None = None) -> bool:
+        """Set a value only if the stored entry is older than ``version``, in one atomic step.
+
+        The version defaults to the current time in nanoseconds; callers that
+        compute a value should pass the time the computation started, so a
+        result that finishes late cannot replace a fresher one. Returns True
+        if the value was written.
+        """
+        if not self._versioned:
+            raise TypeError("set_if_newer requires a RedisCache created with versioned=True.")
+        return bool(self._write_versioned(key, value, version)[0])
+
+    def _write_versioned(self, key: Any, value: Any, version: int | None, client=None):
+        """Run the conditional write, queueing it on ``client`` if a pipeline is given."""
+        version = f"{time.time_ns() if version is None else version:020d}"
+        full_key = self._make_key(key)
+        if self._hot_keys is not None:
+            self._hot_keys.discard(full_key)
+        return self._set_if_newer(keys=[full_key], args=[version, f"{version}|{self._serialize(value)}",
+                                                         int(self._ttl * 1000)], client=client)
+
+    def get_versioned(self, key: Any) -> tuple[Any, int | None]:
+        """Retrieve a value with its version, which is None for entries written without one."""
+        value = self._read('get', self._make_key(key))
+        loaded = self._load(value) if value is not None else None
+        if loaded is None:
+            raise KeyError(key)
+        return loaded
+
+    def get_many(self, keys) -> dict[Any, Any]:
+        """Retrieve several values with a single MGET, returning only the keys found."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._read('mget', [self._make_key(key) for key in keys])
+        loaded = {key: self._load(value) for key, value in zip(keys, values) if value is not None}
+        return {key: value[0] for key, value in loaded.items() if value is not None}
+
+    def set_many(self, mapping, versions=None) -> None:
+        """Set several values with the default TTL in one pipelined round trip.
+
+        On a versioned cache, ``versions`` maps keys to their versions, which
+        default to the current time.
+        """
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in mapping.items():
+            if self._versioned:
+                self._write_versioned(key, value, (versions or {}).get(key), client=pipe)
+            else:
+                pipe.setex(self._make_key(key), self._ttl, self._serialize(value))
+        pipe.execute()
+        if self._hot_keys is not None:
+            for key in mapping:
+                self._hot_keys.discard(self._make_key(key))
+
     def __len__(self) -> int:
         """Return an approximate count of items in the cache."""
         return self._redis.dbsize()
 
     def __iter__(self):
         """Iterate over cache keys."""
-        for key in self._redis.scan_iter():
+        for key in self._redis.scan_iter(count=self._scan_count):
             yield key
 
+    def _scan_pages(self, count=None, match=None):
+        """Yield the keys of each non-empty SCAN page."""
+        cursor = 0
+        while True:
+            cursor, keys = self._redis.scan(cursor, match=match, count=count or self._scan_count)
+            if keys:
+                yield keys
+            if not cursor:
+                break
+
+    def delete_prefix(self, prefix: str, count=None) -> int:
+        """Delete every key starting with ``prefix``, using SCAN MATCH and one UNLINK per page.
+
+        Returns the number of keys deleted.
+        """
+        match = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        deleted = 0
+        for keys in self._scan_pages(count, match):
+            deleted += self._redis.unlink(*keys)
+        if self._hot_keys is not None:
+            self._hot_keys.discard_prefix(prefix)
+        return deleted
+
+    def items(self, count=None, match=None):
+        """Stream ``(key, value)`` pairs, fetching each SCAN page of values with one MGET."""
+        for keys in self._scan_pages(count, match):
+            for key, value in zip(keys, self._redis.mget(keys)):
+                loaded = self._load(value) if value is not None else None
+                if loaded is not None:
+                    yield key, loaded[0]
+
+    def export(self, count=None, match=None):
+        """Stream ``(key, serialized value, remaining TTL in milliseconds or None)`` entries.
+
+        Each SCAN page costs one pipelined round trip of MGET plus PTTL. Keys
+        that expire while being exported are skipped.
+        """
+        for keys in self._scan_pages(count, match):
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            values, *ttls = pipe.execute()
+            for key, value, ttl in zip(keys, values, ttls):
+                if value is None or ttl == -2:
+                    continue
+                yield key, value, ttl if ttl >= 0 else None
+
+    def import_(self, entries, batch_size=1000) -> int:
+        """Restore entries produced by export(), keeping their remaining TTLs.
+
+        ``import`` is a keyword, hence the trailing underscore. Entries are
+        written in pipelined batches of ``batch_size``; entries without a TTL
+        are stored without expiry. Returns the number of entries written.
+        """
+        written = 0
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value, ttl in entries:
+            if ttl is None:
+                pipe.set(key, value)
+            elif ttl > 0:
+                pipe.set(key, value, px=ttl)
+            else:
+                continue
+            if self._hot_keys is not None:
+                self._hot_keys.discard(key)
+            written += 1
+            if written % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        return written
+
     def clear(self) -> None:
         """Clear all items in the cache."""
         self._redis.flushdb()
+        if self._hot_keys is not None:
+            self._hot_keys.clear()
 
     def stats(self) -> dict[str, Any]:
         """Return statistics about the Redis cache."""
         info = self._redis.info()
-        return {
+        data = {
             'keys': self._redis.dbsize(),
             'hits': info['keyspace_hits'],
             'misses': info['keyspace_misses'],
         }
+        if self._hot_keys is not None:
+            data.update(self._hot_keys.stats())
+        return data
 
     def hits(self) -> float:
         """Calculate the cache hit ratio."""
@@ -0,0 +1,357 @@
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, MutableMapping
+
+_MAGIC = b"RCSHM002"
+_HEADER = struct.Struct("<8sIIII")  # magic, sets, ways, slot_size, stripes
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<IB3xQdHxxI")  # seq, state, hash, expires, key length, value length
+_SEQ = struct.Struct("<I")
+
+_EMPTY, _USED, _DELETED = 0, 1, 2
+
+# fcntl byte-range locks may lie beyond the end of the file, so stripes are
+# locked at offsets that never overlap the mapped data.
+_LOCK_BASE = 1 << 40
+_INIT_LOCK = _LOCK_BASE - 1
+
+
+class _Table:
+    """A mapped table file with the thread locks of its stripes, shared by the instances of one process.
+
+    fcntl record locks belong to the process, and closing any descriptor of
+    the file releases all of them, so every instance on the same file must
+    share one descriptor and one set of thread locks.
+    """
+
+    def __init__(self, fd: int, inode: tuple[int, int], size: int, stripes: int):
+        self.fd = fd
+        self.inode = inode
+        self.mmap = mmap.mmap(fd, size)
+        self.thread_locks = [threading.Lock() for _ in range(stripes)]
+        self.refs = 0
+
+
+def _to_tuples(value: Any) -> Any:
+    """Turn the JSON arrays of a decoded key back into tuples, since a list cannot be a key."""
+    if isinstance(value, list):
+        return tuple(_to_tuples(item) for item in value)
+    return value
+
+
+_tables: dict[str, _Table] = {}
+_tables_lock = threading.Lock()
+
+
+class SharedMemoryCache(MutableMapping):
+    """A host-local cache shared by all processes mapping the same file.
+
+    The table is a set-associative hash table of fixed-size slots kept in an
+    mmap'd file (``/dev/shm`` when available). Writers take a striped lock that
+    is both a thread lock and an ``fcntl`` byte-range lock, so they exclude
+    each other across threads and processes. Readers are lock-free: every slot
+    carries a sequence counter that writers make odd while modifying it, and a
+    read is retried when the counter changed underneath it.
+
+    Instances in one process that open the same file share its descriptor,
+    mapping and thread locks; the file is unmapped when the last one is
+    closed. All instances and processes must use the same layout.
+
+    :param name: File name of the shared table; processes using the same name share entries.
+    :param sets: Number of hash sets in the table.
+    :param ways: Number of slots per set; a full set evicts its soonest-expiring entry.
+    :param slot_size: Size of a slot in bytes, bounding the encoded key plus pickled value.
+    :param ttl: Default time-to-live for cache entries in seconds.
+    :param stripes: Number of write lock stripes.
+    :param path: Explicit file path, overriding ``name``.
+    """
+
+    def __init__(self, name="rediscache-cachetools", sets=1024, ways=8, slot_size=1024, ttl=600,
+                 stripes=64, path=None):
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size must be larger than {_SLOT.size} bytes.")
+        if path is None:
+            directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            path = os.path.join(directory, name)
+
+        self._path = path
+        self._sets = sets
+        self._ways = ways
+        self._slot_size = slot_size
+        self._ttl = ttl
+        self._stripes = stripes
+        self._hits = 0
+        self._misses = 0
+        self._table = self._open_table(os.path.realpath(path), _HEADER_SIZE + sets * ways * slot_size)
+        self._fd = self._table.fd
+        self._mmap = self._table.mmap
+        self._thread_locks = self._table.thread_locks
+
+    def _open_table(self, path: str, size: int) -> _Table:
+        """Return this process's table for a file, opening and mapping it on first use."""
+        header = _HEADER.pack(_MAGIC, self._sets, self._ways, self._slot_size, self._stripes)
+        with _tables_lock:
+            table = _tables.get(path)
+            try:
+                stat = os.stat(path)
+                if table is not None and (stat.st_dev, stat.st_ino) != table.inode:
+                    table = None  # The file was replaced; the old table stays with its instances.
+            except FileNotFoundError:
+                table = None
+
+            if table is None:
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.lockf(fd, fcntl.LOCK_EX, 1, _INIT_LOCK)
+                    try:
+                        self._initialize(fd, header, size)
+                    finally:
+                        fcntl.lockf(fd, fcntl.LOCK_UN, 1, _INIT_LOCK)
+                    stat = os.fstat(fd)
+                    table = _Table(fd, (stat.st_dev, stat.st_ino), size, self._stripes)
+                except Exception:
+                    os.close(fd)
+                    raise
+                _tables[path] = table
+            elif table.mmap[:_HEADER.size] != header:
+                raise ValueError(f"Shared cache {self._path} exists with a different layout.")
+
+            table.refs += 1
+            return table
+
+    def _initialize(self, fd: int, header: bytes, size: int) -> None:
+        """Create the table file, or check that an existing one has the same layout."""
+        if os.fstat(fd).st_size == 0:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, header, 0)
+            return
+        if os.pread(fd, _HEADER.size, 0) != header:
+            raise ValueError(f"Shared cache {self._path} exists with a different layout.")
+
+    @staticmethod
+    def _encode_key(key: Any) -> bytes:
+        """Encode a key into bytes that are identical across processes.
+
+        Keys other than str and bytes must be JSON-encodable, such as numbers
+        and tuples of them; tuples come back as tuples when iterating.
+        """
+        if isinstance(key, bytes):
+            return b"b" + key
+        if isinstance(key, str):
+            return b"s" + key.encode("utf-8")
+        try:
+            return b"j" + json.dumps(key, sort_keys=True).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            raise TypeError(f"SharedMemoryCache keys must be str, bytes or JSON-encodable, not {key!r}") from e
+
+    @staticmethod
+    def _decode_key(data: bytes) -> Any:
+        """Decode a key produced by _encode_key."""
+        kind, body = data[:1], data[1:]
+        if kind == b"b":
+            return body
+        if kind == b"s":
+            return body.decode("utf-8")
+        return _to_tuples(json.loads(body))
+
+    @staticmethod
+    def _hash(data: bytes) -> int:
+        # The builtin hash() is salted per process, so it cannot address a shared table.
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def _offset(self, index: int) -> int:
+        return _HEADER_SIZE + index * self._slot_size
+
+    def _set_slots(self, key_hash: int) -> range:
+        first = (key_hash % self._sets) * self._ways
+        return range(first, first + self._ways)
+
+    def _stripe(self, key_hash: int) -> int:
+        return (key_hash % self._sets) % self._stripes
+
+    def _lock(self, stripe: int) -> None:
+        self._thread_locks[stripe].acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _LOCK_BASE + stripe)
+        except Exception:
+            self._thread_locks[stripe].release()
+            raise
+
+    def _unlock(self, stripe: int) -> None:
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _LOCK_BASE + stripe)
+        finally:
+            self._thread_locks[stripe].release()
+
+    def _read_slot(self, index: int, locked: bool = False, retries: int = 64):
+        """Return a consistent ``(state, hash, expires, key, value)`` snapshot of a slot."""
+        offset = self._offset(index)
+        for _ in range(1 if locked else retries):
+            seq = _SEQ.unpack_from(self._mmap, offset)[0]
+            if seq & 1 and not locked:
+                continue
+            data = self._mmap[offset:offset + self._slot_size]
+            if _SEQ.unpack_from(self._mmap, offset)[0] != seq:
+                continue
+            _, state, key_hash, expires, klen, vlen = _SLOT.unpack_from(data)
+            if state != _USED or seq & 1:
+                # An odd counter seen under the lock was left by a writer that died mid-write.
+                return _EMPTY if seq & 1 else state, key_hash, expires, b"", b""
+            start = _SLOT.size
+            return state, key_hash, expires, data[start:start + klen], data[start + klen:start + klen + vlen]
+        # A writer kept the slot busy; fall back to reading under its lock.
+        stripe = (index // self._ways) % self._stripes
+        self._lock(stripe)
+        try:
+            return self._read_slot(index, locked=True)
+        finally:
+            self._unlock(stripe)
+
+    def _write_slot(self, index: int, state: int, key_hash: int = 0, expires: float = 0.0,
+                    key: bytes = b"", value: bytes = b"") -> None:
+        """Overwrite a slot; the caller must hold the slot's stripe lock."""
+        offset = self._offset(index)
+        busy = (_SEQ.unpack_from(self._mmap, offset)[0] | 1) & 0xFFFFFFFF
+        _SEQ.pack_into(self._mmap, offset, busy)
+        _SLOT.pack_into(self._mmap, offset, busy, state, key_hash, expires, len(key), len(value))
+        start = offset + _SLOT.size
+        self._mmap[start:start + len(key) + len(value)] = key + value
+        _SEQ.pack_into(self._mmap, offset, (busy + 1) & 0xFFFFFFFF)
+
+    def _find(self, key_bytes: bytes, key_hash: int, locked: bool = False):
+        """Return ``(index, expires, value)`` of the slot holding a key, or None."""
+        for index in self._set_slots(key_hash):
+            state, slot_hash, expires, slot_key, value = self._read_slot(index, locked)
+            if state == _USED and slot_hash == key_hash and slot_key == key_bytes:
+                return index, expires, value
+        return None
+
+    def __getitem__(self, key: Any) -> Any:
+        """Retrieve a value from the cache."""
+        key_bytes = self._encode_key(key)
+        found = self._find(key_bytes, self._hash(key_bytes))
+        if found is None or found[1] <= time.time():
+            self._misses += 1
+            raise KeyError(key)
+        self._hits += 1
+        return pickle.loads(found[2])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a value in the cache with the default TTL."""
+        key_bytes = self._encode_key(key)
+        value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if _SLOT.size + len(key_bytes) + len(value_bytes) > self._slot_size:
+            raise ValueError("value too large")
+
+        key_hash = self._hash(key_bytes)
+        now = time.time()
+        stripe = self._stripe(key_hash)
+        self._lock(stripe)
+        try:
+            victim = victim_expires = None
+            for index in self._set_slots(key_hash):
+                state, slot_hash, expires, slot_key, _ = self._read_slot(index, locked=True)
+                if state == _USED and slot_hash == key_hash and slot_key == key_bytes:
+                    victim = index
+                    break
+                if state != _USED or expires <= now:
+                    expires = float("-inf")
+                if victim is None or expires < victim_expires:
+                    victim, victim_expires = index, expires
+            self._write_slot(victim, _USED, key_hash, now + self._ttl, key_bytes, value_bytes)
+        finally:
+            self._unlock(stripe)
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a value from the cache."""
+        key_bytes = self._encode_key(key)
+        key_hash = self._hash(key_bytes)
+        stripe = self._stripe(key_hash)
+        self._lock(stripe)
+        try:
+            found = self._find(key_bytes, key_hash, locked=True)
+            if found is None:
+                raise KeyError(key)
+            self._write_slot(found[0], _DELETED)
+        finally:
+            self._unlock(stripe)
+        if found[1] <= time.time():
+            raise KeyError(key)
+
+    def _live_keys(self):
+        now = time.time()
+        for index in range(self._sets * self._ways):
+            state, _, expires, key, _ = self._read_slot(index)
+            if state == _USED and expires > now:
+                yield key
+
+    def __len__(self) -> int:
+        """Return the number of unexpired entries."""
+        return sum(1 for _ in self._live_keys())
+
+    def __iter__(self):
+        """Iterate over unexpired cache keys."""
+        for key in self._live_keys():
+            yield self._decode_key(key)
+
+    def clear(self) -> None:
+        """Clear all items in the cache, for every process sharing it."""
+        for stripe in range(self._stripes):
+            self._lock(stripe)
+            try:
+                for set_index in range(stripe, self._sets, self._stripes):
+                    for index in range(set_index * self._ways, (set_index + 1) * self._ways):
+                        if self._read_slot(index, locked=True)[0] != _EMPTY:
+                            self._write_slot(index, _EMPTY)
+            finally:
+                self._unlock(stripe)
+
+    def stats(self) -> dict[str, Any]:
+        """Return statistics about the shared cache as seen by this process."""
+        return {
+            'keys': len(self),
+            'hits': self._hits,
+            'misses': self._misses,
+        }
+
+    def hits(self) -> float:
+        """Calculate the cache hit ratio of this process."""
+        total = self._hits + self._misses
+        return float(self._hits) / total if total > 0 else 0.0
+
+    def reset(self) -> None:
+        """Reset the cache statistics."""
+        self._hits = self._misses = 0
+
+    def close(self) -> None:
+        """Release the shared table, unmapping it once no instance of this process uses it.
+
+        The file is left in place for other processes.
+        """
+        with _tables_lock:
+            table, self._table = self._table, None
+            if table is None:
+                return
+            table.refs -= 1
+            if table.refs:
+                return
+            path = os.path.realpath(self._path)
+            if _tables.get(path) is table:
+                del _tables[path]
+            table.mmap.close()
+            os.close(table.fd)
+
+    def unlink(self) -> None:
+        """Remove the shared table file."""
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
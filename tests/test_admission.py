@@ -0,0 +1,92 @@
+import threading
+
+from cachetools import LRUCache, TTLCache
+
+from rediscache_cachetools.admission import BloomFilter, TinyLFU, default_victim
+from rediscache_cachetools.chain_cache import ChainCache
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(size=1024, hashes=3)
+    assert not bloom.add("a")
+    assert bloom.add("a")
+    assert "a" in bloom
+    assert "b" not in bloom
+    bloom.clear()
+    assert "a" not in bloom
+
+
+def test_tiny_lfu_doorkeeper():
+    admission = TinyLFU(width=256)
+    assert admission.frequency("a") == 0
+    admission.record("a")
+    assert admission.frequency("a") == 1
+    admission.record("a")
+    admission.record("a")
+    assert admission.frequency("a") == 3
+
+
+def test_tiny_lfu_aging():
+    admission = TinyLFU(width=256, sample_size=4)
+    for _ in range(4):
+        admission.record("a")
+    assert admission.frequency("a") == 1
+
+
+def test_tiny_lfu_admit():
+    cache = LRUCache(maxsize=1)
+    admission = TinyLFU(width=256)
+    assert admission.admit("a", cache)  # Not full
+    cache["a"] = 1
+    admission.record("a")
+    admission.record("a")
+    assert admission.admit("a", cache)  # Already present
+    admission.record("b")
+    assert not admission.admit("b", cache)
+    for _ in range(3):
+        admission.record("b")
+    assert admission.admit("b", cache)
+
+
+def test_tiny_lfu_threads():
+    tiny_lfu = TinyLFU(width=64, sample_size=100)
+
+    def work(n):
+        for i in range(1000):
+            tiny_lfu.record(i % 10 + n)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tiny_lfu._records == 4000 % 100
+    assert tiny_lfu.frequency(5) > 0
+
+
+def test_chain_cache_admission_rejects_one_hit_wonders():
+    cache1, cache2 = LRUCache(maxsize=2), LRUCache(maxsize=100)
+    chain = ChainCache(cache1, cache2, admission=TinyLFU(width=256))
+    for key in ("hot1", "hot2"):
+        for _ in range(3):
+            try:
+                chain[key]
+            except KeyError:
+                chain[key] = key
+
+    for key in range(10):
+        cache2[key] = key
+        assert chain[key] == key
+        chain[f"new{key}"] = key
+
+    assert set(cache1) == {"hot1", "hot2"}
+    assert cache2["new9"] == 9  # The last level always receives writes
+
+
+def test_default_victim_follows_recency():
+    for cache in (LRUCache(maxsize=3), TTLCache(maxsize=3, ttl=60)):
+        for key in "abc":
+            cache[key] = key
+        _ = cache["a"]
+        assert default_victim(cache) == "b"
+    assert default_victim({"x": 1, "y": 2}) == "x"
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from cachetools import LRUCache
+
+from rediscache_cachetools.batching import CacheBatch, current_batch
+from rediscache_cachetools.cached import Cached
+
+
+class BulkCache(LRUCache):
+    """An LRUCache recording the bulk calls made to it."""
+
+    def __init__(self):
+        super().__init__(maxsize=100)
+        self.get_many_calls = []
+        self.set_many_calls = []
+
+    def get_many(self, keys):
+        self.get_many_calls.append(keys)
+        return {key: self[key] for key in keys if key in self}
+
+    def set_many(self, mapping):
+        self.set_many_calls.append(mapping)
+        self.update(mapping)
+
+
+@pytest.fixture
+def cache():
+    return BulkCache()
+
+
+def test_batch_coalesces_lookups(cache):
+    calls = []
+
+    @Cached(cache=cache, info=True)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    square(1)
+    with CacheBatch() as batch:
+        assert current_batch() is batch
+        futures = [square.load(x) for x in (1, 2, 3, 2)]
+        assert not any(future.done() for future in futures)
+
+    assert current_batch() is None
+    assert [future.result() for future in futures] == [1, 4, 9, 4]
+    assert calls == [1, 2, 3]
+    assert cache.get_many_calls == [[":(1,):{}", ":(2,):{}", ":(3,):{}"]]
+    assert cache.set_many_calls == [{":(2,):{}": 4, ":(3,):{}": 9}]
+    assert square.cache_info().hits == 1
+
+
+def test_result_dispatches_early(cache):
+    @Cached(cache=cache)
+    def square(x):
+        return x * x
+
+    with CacheBatch():
+        first, second = square.load(2), square.load(3)
+        assert first.result() == 4
+        assert second.done()
+    assert len(cache.get_many_calls) == 1
+
+
+def test_load_outside_batch(cache):
+    @Cached(cache=cache)
+    def square(x):
+        return x * x
+
+    assert square.load(5).result() == 25
+
+
+def test_batch_exceptions(cache):
+    @Cached(cache=cache)
+    def invert(x):
+        return 1 / x
+
+    with CacheBatch():
+        good, bad = invert.load(2), invert.load(0)
+    assert good.result() == 0.5
+    with pytest.raises(ZeroDivisionError):
+        bad.result()
+
+
+def test_aload_coalesces_per_tick(cache):
+    @Cached(cache=cache)
+    def square(x):
+        return x * x
+
+    async def main():
+        return await asyncio.gather(*(square.aload(x) for x in range(5)))
+
+    assert asyncio.run(main()) == [0, 1, 4, 9, 16]
+    assert len(cache.get_many_calls) == 1
+
+
+class FailingWriteCache(BulkCache):
+    def set_many(self, mapping):
+        raise ConnectionError("write failed")
+
+
+def test_failed_write_back_still_resolves():
+    @Cached(cache=FailingWriteCache())
+    def square(x):
+        return x * x
+
+    with CacheBatch():
+        future = square.load(2)
+    assert future.result(timeout=1) == 4
+
+    async def main():
+        return await asyncio.wait_for(square.aload(3), timeout=1)
+
+    assert asyncio.run(main()) == 9
+
+
+def test_failed_lookup_settles_every_future():
+    class FailingReadCache(BulkCache):
+        def get_many(self, keys):
+            raise ConnectionError("read failed")
+
+    @Cached(cache=FailingReadCache())
+    def square(x):
+        return x * x
+
+    with CacheBatch():
+        futures = [square.load(x) for x in range(3)]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(timeout=1)
@@ -120,3 +120,44 @@ def test_cache_chain_reset():
     chain.reset()
     cache1.reset.assert_called_once()
     cache2.reset.assert_called_once()
+
+
+class VersionedCache(dict):
+    """A dict storing (value, version) pairs, standing in for a versioned RedisCache."""
+
+    versioned = True
+
+    def __getitem__(self, key):
+        return self.get_versioned(key)[0]
+
+    def get_versioned(self, key):
+        return dict.__getitem__(self, key)
+
+    def set_if_newer(self, key, value, version):
+        if key in self and dict.__getitem__(self, key)[1] >= version:
+            return False
+        dict.__setitem__(self, key, (value, version))
+        return True
+
+
+def test_cache_chain_set_if_newer():
+    cache1, cache2 = LRUCache(maxsize=2), VersionedCache()
+    chain = ChainCache(cache1, cache2)
+    assert chain.versioned
+
+    assert chain.set_if_newer('a', 'fresh', version=2)
+    assert cache1['a'] == 'fresh'
+
+    # A stale write is rejected and the upper level drops its copy
+    assert not chain.set_if_newer('a', 'stale', version=1)
+    assert 'a' not in cache1
+    assert chain['a'] == 'fresh'
+
+
+def test_cache_chain_versioned_promotion():
+    cache1, cache2 = VersionedCache(), VersionedCache()
+    chain = ChainCache(cache1, cache2)
+    cache2.set_if_newer('a', 'value', 3)
+    assert chain['a'] == 'value'
+    # The promoted copy keeps the version of the level it came from
+    assert cache1.get_versioned('a') == ('value', 3)
@@ -0,0 +1,254 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from cachetools import LRUCache
+
+from rediscache_cachetools.cached import Cached, CachedMethod
+from rediscache_cachetools.chain_cache import ChainCache
+
+
+def test_cached_variants():
+    for lock in (None, threading.Lock()):
+        for info in (False, True):
+            calls = []
+
+            @Cached(cache=LRUCache(maxsize=10), lock=lock, info=info)
+            def square(x):
+                calls.append(x)
+                return x * x
+
+            assert [square(2), square(2), square(3)] == [4, 4, 9]
+            assert calls == [2, 3]
+            if info:
+                assert square.cache_info() == (1, 2, None, 2)
+                square.cache_clear()
+                assert square.cache_info() == (0, 0, None, 0)
+
+
+def test_cached_key_function():
+    cache = LRUCache(maxsize=10)
+
+    @Cached(cache=cache, key=lambda func, x: f"{func.__name__}-{x}", prefix="app")
+    def square(x):
+        return x * x
+
+    square(3)
+    assert list(cache) == ["app:square-3"]
+
+
+def test_warm_computes_missing_entries():
+    calls = []
+    cache = LRUCache(maxsize=10)
+
+    @Cached(cache=cache, lock=threading.Lock())
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(2) == 4
+    assert square.warm([1, 2, (3,)]) == 2
+    assert sorted(calls) == [1, 2, 3]
+
+    assert square(3) == 9
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_warm_uses_bulk_cache_methods():
+    cache = MagicMock()
+    cache.get_many.return_value = {":(1,):{}": 1}
+    cached = Cached(cache=cache)
+    del cache.make_key
+
+    @cached
+    def identity(x):
+        return x
+
+    assert identity.warm([1, 2, 3], batch_size=10) == 2
+    cache.get_many.assert_called_once_with([":(1,):{}", ":(2,):{}", ":(3,):{}"])
+    cache.set_many.assert_called_once_with({":(2,):{}": 2, ":(3,):{}": 3})
+
+
+def test_warm_skips_failures():
+    cache = LRUCache(maxsize=10)
+
+    @Cached(cache=cache)
+    def invert(x):
+        return 1 / x
+
+    assert invert.warm([1, 0, 2]) == 2
+    assert set(cache) == {":(1,):{}", ":(2,):{}"}
+
+
+def test_prefetch():
+    cache = LRUCache(maxsize=10)
+
+    @Cached(cache=cache)
+    def square(x):
+        return x * x
+
+    assert square.prefetch(4).result() == 16
+    assert cache[":(4,):{}"] == 16
+
+
+def test_prefetch_and_wrapper_share_the_decorated_path():
+    cache = LRUCache(maxsize=10)
+    cached = Cached(cache=cache, lock=threading.Lock(), info=True)
+
+    def square(x):
+        return x * x
+
+    wrapped = cached(square)
+    assert wrapped.prefetch(4).result() == 16
+    assert cached.wrapper(square, 4) == 16
+    assert cached.make_key(square, 4) == ":(4,):{}"
+    assert wrapped.cache_info() == (1, 1, None, 1)
+
+
+def test_versioned_cache_uses_start_time():
+    writes = []
+
+    class VersionedCache(LRUCache):
+        versioned = True
+
+        def set_if_newer(self, key, value, version):
+            writes.append((key, value, version))
+            self[key] = value
+            return True
+
+    @Cached(cache=VersionedCache(maxsize=10))
+    def slow(x):
+        slow.finished = time.time_ns()
+        return x
+
+    slow(1)
+    assert writes[0][:2] == (":(1,):{}", 1)
+    assert writes[0][2] <= slow.finished
+
+
+class TombstoneCache(dict):
+    """A versioned cache whose deletes leave a tombstone, like RedisCache(versioned=True)."""
+
+    versioned = True
+
+    def __getitem__(self, key):
+        value, version = self.get_versioned(key)
+        return value
+
+    def get_versioned(self, key):
+        value, version, tombstone = dict.__getitem__(self, key)
+        if tombstone:
+            raise KeyError(key)
+        return value, version
+
+    def __delitem__(self, key):
+        dict.__setitem__(self, key, (None, time.time_ns(), True))
+
+    def set_if_newer(self, key, value, version=None):
+        version = time.time_ns() if version is None else version
+        if key in self and dict.__getitem__(self, key)[1] >= version:
+            return False
+        dict.__setitem__(self, key, (value, version, False))
+        return True
+
+
+def test_warm_rejects_write_started_before_tombstone():
+    for cache in (TombstoneCache(), ChainCache(LRUCache(maxsize=10), TombstoneCache())):
+        @Cached(cache=cache)
+        def invalidated_while_computing(x):
+            del cache[":(1,):{}"]  # A concurrent invalidation lands mid-computation
+            return "stale"
+
+        invalidated_while_computing.warm([1])
+        with pytest.raises(KeyError):
+            _ = cache[":(1,):{}"]
+
+
+def test_cached_method_rejects_write_started_before_tombstone():
+    class Report:
+        id = 1
+        cache = TombstoneCache()
+
+        @CachedMethod(cache=lambda self: self.cache)
+        def render(self):
+            del Report.cache[Report.render.cache_namespace(self) + "render:():{}"]  # Invalidated mid-computation
+            return "stale"
+
+    report = Report()
+    assert report.render() == "stale"
+    with pytest.raises(KeyError):
+        _ = Report.cache[Report.render.cache_namespace(report) + "render:():{}"]
+
+
+class Account:
+    calls = 0
+
+    def __init__(self, account_id, cache):
+        self.id = account_id
+        self.cache = cache
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<Account at {id(self):#x}>"
+
+    @CachedMethod(cache=lambda self: self.cache, lock=lambda self: self.lock)
+    def balance(self, currency="USD"):
+        Account.calls += 1
+        return f"{self.id}:{currency}"
+
+    @CachedMethod(cache=lambda self: self.cache, lock=lambda self: self.lock)
+    def owner(self):
+        Account.calls += 1
+        return f"owner of {self.id}"
+
+
+def test_cached_method_keys_use_identity():
+    cache = LRUCache(maxsize=10)
+    Account.calls = 0
+
+    assert Account(1, cache).balance() == "1:USD"
+    assert Account(1, cache).balance() == "1:USD"
+    assert Account(2, cache).balance("EUR") == "2:EUR"
+    assert Account.calls == 2
+    assert f"{__name__}.Account:1:balance:():{{}}" in cache
+
+
+def test_cached_method_cache_clear():
+    cache = LRUCache(maxsize=10)
+    account, other = Account(1, cache), Account(2, cache)
+    account.balance()
+    account.owner()
+    other.owner()
+
+    Account.balance.cache_clear(account)
+    assert list(cache) == [f"{__name__}.Account:2:owner:():{{}}"]
+
+
+def test_cached_method_cache_clear_chain():
+    cache1, cache2 = LRUCache(maxsize=2), LRUCache(maxsize=100)
+    chain = ChainCache(cache1, cache2)
+    account, other = Account(1, chain), Account(2, chain)
+    for currency in ("USD", "EUR", "GBP"):
+        account.balance(currency)
+    other.owner()
+
+    Account.balance.cache_clear(account)
+    assert not any(key.startswith(f"{__name__}.Account:1:") for key in list(cache1) + list(cache2))
+    assert f"{__name__}.Account:2:owner:():{{}}" in cache2
+
+
+def test_cached_method_identity_callable():
+    cache = LRUCache(maxsize=10)
+
+    class Row:
+        def __init__(self, table, pk):
+            self.table, self.pk = table, pk
+
+        @CachedMethod(cache=cache, identity=lambda row: f"{row.table}/{row.pk}", prefix="rows")
+        def load(self):
+            return self.pk
+
+    assert Row("users", 7).load() == 7
+    assert Row.load.cache_namespace(Row("users", 7)) == f"rows:{__name__}.{Row.__qualname__}:users/7:"
+    assert len(cache) == 1
@@ -0,0 +1,121 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+from cachetools import LRUCache
+
+from rediscache_cachetools.chain_cache import ChainCache
+from rediscache_cachetools.disk_cache import SQLiteCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture
+def cache(path):
+    cache = SQLiteCache(path=path, ttl=10, maxsize=100)
+    yield cache
+    cache.close()
+
+
+def test_set_and_get_item(cache):
+    cache["key1"] = {"foo": [1, 2]}
+    cache[("tuple", 3)] = b"bytes"
+    assert cache["key1"] == {"foo": [1, 2]}
+    assert cache[("tuple", 3)] == b"bytes"
+
+
+def test_get_missing_key(cache):
+    with pytest.raises(KeyError):
+        _ = cache["missing_key"]
+
+
+def test_delete_item(cache):
+    cache["key1"] = "value1"
+    del cache["key1"]
+    with pytest.raises(KeyError):
+        _ = cache["key1"]
+    with pytest.raises(KeyError):
+        del cache["key1"]
+
+
+def test_ttl_expiry(path):
+    cache = SQLiteCache(path=path, ttl=0.05)
+    cache["key1"] = "value1"
+    time.sleep(0.1)
+    with pytest.raises(KeyError):
+        _ = cache["key1"]
+    assert len(cache) == 0
+    assert cache.expire() == 1
+
+
+def test_maxsize_eviction(path):
+    cache = SQLiteCache(path=path, ttl=10, maxsize=3, touch_interval=0)
+    for i in range(3):
+        cache[f"key{i}"] = i
+    _ = cache["key0"]  # Refresh key0 so key1 is the least recently accessed
+    cache["key3"] = 3
+    assert set(cache) == {"key0", "key2", "key3"}
+
+
+def test_persistence(path):
+    cache = SQLiteCache(path=path)
+    cache["key1"] = "value1"
+    cache.close()
+
+    reopened = SQLiteCache(path=path)
+    assert reopened["key1"] == "value1"
+
+
+def test_threads(cache):
+    def work(n):
+        for i in range(20):
+            cache[f"{n}:{i}"] = i
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 80
+
+
+def test_chain_cache_middle_tier(cache):
+    l1 = LRUCache(maxsize=2)
+    l3 = LRUCache(maxsize=10)
+    chain = ChainCache(l1, cache, l3)
+    l3["key1"] = "value1"
+    assert chain["key1"] == "value1"
+    assert cache["key1"] == "value1"
+    assert l1["key1"] == "value1"
+
+
+def test_touch_interval(path):
+    cache = SQLiteCache(path=path, ttl=10, touch_interval=60)
+    cache["key1"] = "value1"
+    statements = []
+    cache._connection().set_trace_callback(statements.append)
+    _ = cache["key1"]
+    assert not any(statement.startswith("UPDATE") for statement in statements)
+
+
+
+def _child_set(cache, key, value, reused):
+    inherited = cache._local.conn
+    cache[key] = value
+    reused.value = cache._connection() is inherited
+
+
+def test_fork_opens_new_connection(cache):
+    cache["key1"] = "value1"
+    context = multiprocessing.get_context("fork")
+    reused = context.Value("b", True)
+    process = context.Process(target=_child_set, args=(cache, "key2", "value2", reused))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    assert not reused.value
+    assert cache["key2"] == "value2"
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from cachetools import LRUCache
+
+from rediscache_cachetools.chain_cache import ChainCache
+from rediscache_cachetools.hot_keys import CountMinSketch, HotKeys
+
+
+def test_count_min_sketch():
+    sketch = CountMinSketch(width=64, depth=4)
+    for _ in range(10):
+        sketch.add("a")
+    sketch.add("b")
+    assert sketch.estimate("a") >= 10
+    assert sketch.estimate("b") >= 1
+    sketch.halve()
+    assert sketch.estimate("a") >= 5
+    sketch.clear()
+    assert sketch.estimate("a") == 0
+
+
+def test_count_min_sketch_small_int_keys():
+    sketch = CountMinSketch(width=64, depth=4)
+    for _ in range(100):
+        sketch.add(5)
+    # 5 and 69 share an index modulo 64 but must not collide in every row
+    assert sketch.estimate(69) == 0
+
+
+def test_hot_keys_detection_and_replica():
+    hot_keys = HotKeys(threshold=3, top_k=2, ttl=10)
+    for _ in range(3):
+        hot_keys.record("hot")
+    hot_keys.record("cold")
+    assert hot_keys.is_hot("hot")
+    assert not hot_keys.is_hot("cold")
+
+    hot_keys.promote("hot", 1)
+    hot_keys.promote("cold", 2)
+    assert hot_keys.get("hot") == 1
+    with pytest.raises(KeyError):
+        hot_keys.get("cold")
+
+    hot_keys.discard("hot")
+    with pytest.raises(KeyError):
+        hot_keys.get("hot")
+    assert hot_keys.stats()['hot_keys'] == [("hot", 3)]
+
+
+def test_hot_keys_top_k_bound():
+    hot_keys = HotKeys(threshold=1, top_k=2, width=1024)
+    for key, count in (("a", 3), ("b", 1), ("c", 2)):
+        for _ in range(count):
+            hot_keys.record(key)
+    assert [key for key, _ in hot_keys.stats()['hot_keys']] == ["a", "c"]
+
+
+def test_hot_keys_aging():
+    hot_keys = HotKeys(threshold=2, sample_size=4)
+    hot_keys.record("a")
+    hot_keys.record("a")
+    assert hot_keys.is_hot("a")
+    hot_keys.record("b")
+    hot_keys.record("c")
+    assert not hot_keys.is_hot("a")
+
+
+def test_hot_keys_replica_ttl():
+    hot_keys = HotKeys(threshold=1, ttl=0.05)
+    hot_keys.record("a")
+    hot_keys.promote("a", 1)
+    time.sleep(0.1)
+    with pytest.raises(KeyError):
+        hot_keys.get("a")
+
+
+def test_chain_cache_hot_keys():
+    cache1, cache2 = LRUCache(maxsize=2), LRUCache(maxsize=5)
+    chain = ChainCache(cache1, cache2, hot_keys=HotKeys(threshold=2, ttl=10))
+    chain['a'] = 1
+    assert chain['a'] == 1
+    assert chain['a'] == 1
+    cache1.clear()
+    cache2.clear()
+    assert chain['a'] == 1  # Served from the local copy
+    chain['a'] = 2
+    assert chain['a'] == 2
+    assert chain.stats()['hot_keys']['hot_keys'] == [('a', 4)]
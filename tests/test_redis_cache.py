@@ -1,7 +1,12 @@
+import importlib.util
 import json
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import redis
+
+from rediscache_cachetools.hot_keys import HotKeys
 from rediscache_cachetools.redis_cache import RedisCache
 
 
@@ -109,3 +114,246 @@ class TestRedisCache(unittest.TestCase):
 
         value = b'foo'
         self.assertEqual(self.cache._deserialize(self.cache._serialize(value)), value)
+
+    def test_get_many(self):
+        self.mock_redis.mget.return_value = ['1', None, 'json:[1, 2]']
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': '1', 'c': [1, 2]})
+        self.mock_redis.mget.assert_called_once_with(['a', 'b', 'c'])
+        self.assertEqual(self.cache.get_many([]), {})
+
+    def test_set_many(self):
+        pipe = self.mock_redis.pipeline.return_value
+        self.cache.set_many({'a': 1, 'b': [1]})
+        pipe.setex.assert_any_call('a', 10, '1')
+        pipe.setex.assert_any_call('b', 10, 'json:[1]')
+        pipe.execute.assert_called_once()
+
+    def test_delete_prefix(self):
+        self.mock_redis.scan.side_effect = [(3, ['ns:a', 'ns:b']), (0, [])]
+        self.mock_redis.unlink.return_value = 2
+        self.assertEqual(self.cache.delete_prefix('ns*:'), 2)
+        self.mock_redis.scan.assert_any_call(0, match='ns\\*:*', count=1000)
+        self.mock_redis.unlink.assert_called_once_with('ns:a', 'ns:b')
+
+    def test_items(self):
+        self.mock_redis.scan.side_effect = [(5, ['a', 'b']), (0, ['c'])]
+        self.mock_redis.mget.side_effect = [['1', None], ['json:[1]']]
+        self.assertEqual(list(self.cache.items(count=2)), [('a', '1'), ('c', [1])])
+        self.mock_redis.scan.assert_any_call(5, match=None, count=2)
+
+    def test_export(self):
+        self.mock_redis.scan.side_effect = [(0, ['a', 'b', 'c'])]
+        pipe = self.mock_redis.pipeline.return_value
+        pipe.execute.return_value = [['1', 'json:[1]', None], 5000, -1, -2]
+        self.assertEqual(list(self.cache.export(match='test:*')), [('a', '1', 5000), ('b', 'json:[1]', None)])
+        self.mock_redis.scan.assert_called_once_with(0, match='test:*', count=1000)
+        pipe.mget.assert_called_once_with(['a', 'b', 'c'])
+
+    def test_import(self):
+        pipe = self.mock_redis.pipeline.return_value
+        entries = [('a', '1', 5000), ('b', 'json:[1]', None), ('c', '2', 0)]
+        self.assertEqual(self.cache.import_(entries, batch_size=1), 2)
+        pipe.set.assert_any_call('a', '1', px=5000)
+        pipe.set.assert_any_call('b', 'json:[1]')
+        self.assertEqual(pipe.execute.call_count, 3)
+
+
+class TestRedisCacheReplicas(unittest.TestCase):
+
+    @patch('redis.StrictRedis')
+    def setUp(self, mock_redis):
+        self.primary, self.replica1, self.replica2 = MagicMock(), MagicMock(), MagicMock()
+        mock_redis.side_effect = [self.primary, self.replica1, self.replica2]
+        self.cache = RedisCache(ttl=10, replicas=[('replica1', 6379), ('replica2', 6379)])
+
+    def test_reads_round_robin_over_replicas(self):
+        self.replica1.get.return_value = 'one'
+        self.replica2.get.return_value = 'two'
+        self.assertEqual([self.cache['key'] for _ in range(4)], ['one', 'two', 'one', 'two'])
+        self.primary.get.assert_not_called()
+
+    def test_writes_go_to_primary(self):
+        self.cache['key'] = 'value'
+        del self.cache['key']
+        self.primary.setex.assert_called_once_with('key', 10, 'value')
+        self.primary.delete.assert_called_once_with('key')
+        self.replica1.setex.assert_not_called()
+        self.replica2.delete.assert_not_called()
+
+    def test_failed_replica_falls_back_to_primary(self):
+        self.replica1.get.side_effect = redis.exceptions.ConnectionError()
+        self.replica2.get.side_effect = redis.exceptions.ConnectionError()
+        self.primary.get.return_value = 'primary'
+        self.assertEqual(self.cache['key'], 'primary')
+        self.assertEqual(self.cache['key'], 'primary')
+        self.assertEqual(self.cache['key'], 'primary')
+        # Both replicas are skipped after failing once
+        self.assertEqual(self.replica1.get.call_count + self.replica2.get.call_count, 2)
+
+    def test_least_latency(self):
+        with patch('redis.StrictRedis', side_effect=[self.primary, self.replica1, self.replica2]):
+            cache = RedisCache(replicas=[('replica1', 6379), ('replica2', 6379)], read_strategy='least_latency')
+        cache._latencies = [0.5, 0.1]
+        self.replica2.mget.return_value = ['value']
+        self.assertEqual(cache.get_many(['key']), {'key': 'value'})
+        self.replica1.mget.assert_not_called()
+
+    def test_least_latency_probes_recovered_replica(self):
+        with patch('redis.StrictRedis', side_effect=[self.primary, self.replica1, self.replica2]):
+            cache = RedisCache(replicas=[('replica1', 6379), ('replica2', 6379)], read_strategy='least_latency',
+                               probe_interval=4)
+        # replica1 had one slow read and has since recovered
+        cache._latencies = [1.0, 0.001]
+        self.replica1.get.return_value = 'one'
+        self.replica2.get.return_value = 'two'
+        for _ in range(3):
+            _ = cache['key']
+        self.replica1.get.assert_not_called()
+        _ = cache['key']  # The fourth read probes replica1
+        self.assertLess(cache._latencies[0], 0.001)
+        _ = cache['key']
+        self.assertEqual(self.replica1.get.call_count, 2)
+
+    def test_unknown_read_strategy(self):
+        with self.assertRaises(ValueError):
+            RedisCache(read_strategy='random')
+
+    def test_invalid_probe_interval(self):
+        with self.assertRaises(ValueError):
+            RedisCache(read_strategy='least_latency', probe_interval=0)
+
+    @patch('redis.sentinel.Sentinel')
+    def test_sentinel(self, mock_sentinel):
+        sentinels = mock_sentinel.return_value
+        cache = RedisCache(sentinel=[('sentinel', 26379)], service_name='cache')
+        sentinels.master_for.assert_called_once_with('cache', db=0, decode_responses=True)
+        sentinels.slave_for.assert_called_once_with('cache', db=0, decode_responses=True)
+        sentinels.slave_for.return_value.get.return_value = 'value'
+        self.assertEqual(cache['key'], 'value')
+
+
+class TestRedisCacheHotKeys(unittest.TestCase):
+
+    @patch('redis.StrictRedis')
+    def setUp(self, mock_redis):
+        self.mock_redis = mock_redis.return_value
+        self.cache = RedisCache(ttl=10, hot_keys=HotKeys(threshold=2, ttl=10))
+
+    def test_hot_key_is_replicated_locally(self):
+        self.mock_redis.get.return_value = 'value'
+        for _ in range(4):
+            self.assertEqual(self.cache['key'], 'value')
+        # The first two reads make the key hot, later reads are local
+        self.assertEqual(self.mock_redis.get.call_count, 2)
+
+        self.cache['key'] = 'new'
+        self.mock_redis.get.return_value = 'new'
+        self.assertEqual(self.cache['key'], 'new')
+
+    def test_stats_include_hot_keys(self):
+        self.mock_redis.info.return_value = {'keyspace_hits': 1, 'keyspace_misses': 0}
+        self.mock_redis.get.return_value = 'value'
+        for _ in range(3):
+            _ = self.cache['key']
+        stats = self.cache.stats()
+        self.assertEqual(stats['hot_keys'], [('key', 3)])
+        self.assertEqual(stats['replica_hits'], 1)
+
+
+class TestRedisCacheVersioned(unittest.TestCase):
+
+    @patch('redis.StrictRedis')
+    def setUp(self, mock_redis):
+        self.mock_redis = mock_redis.return_value
+        self.script = self.mock_redis.register_script.return_value
+        self.cache = RedisCache(ttl=10, versioned=True, tombstone_ttl=30)
+
+    def test_set_if_newer(self):
+        self.script.return_value = [1, 0]
+        self.assertTrue(self.cache.set_if_newer('key', {'a': 1}, version=42))
+        self.script.assert_called_once_with(
+            keys=['key'], args=[f"{42:020d}", f"{42:020d}|json:" + '{"a": 1}', 10000], client=None)
+
+        self.script.return_value = [0, 1]
+        self.assertFalse(self.cache.set_if_newer('key', 'stale', version=41))
+
+    def test_set_many_versions(self):
+        pipe = self.mock_redis.pipeline.return_value
+        self.cache.set_many({'a': 1}, versions={'a': 7})
+        self.script.assert_called_once_with(keys=['a'], args=[f"{7:020d}", f"{7:020d}|1", 10000], client=pipe)
+
+    def test_get_versioned(self):
+        self.mock_redis.get.return_value = f"{42:020d}|json:[1]"
+        self.assertEqual(self.cache.get_versioned('key'), ([1], 42))
+        self.assertEqual(self.cache['key'], [1])
+
+        self.mock_redis.get.return_value = 'unversioned'
+        self.assertEqual(self.cache.get_versioned('key'), ('unversioned', None))
+
+    def test_tombstone_is_a_miss(self):
+        self.mock_redis.get.return_value = f"{42:020d}!"
+        with self.assertRaises(KeyError):
+            _ = self.cache['key']
+        self.mock_redis.mget.return_value = [f"{42:020d}!", f"{42:020d}|1"]
+        self.assertEqual(self.cache.get_many(['a', 'b']), {'b': '1'})
+
+    def test_delete_writes_tombstone(self):
+        self.script.return_value = [1, 1]
+        del self.cache['key']
+        args = self.script.call_args.kwargs['args']
+        self.assertTrue(args[1].endswith('!'))
+        self.assertEqual(args[2], 30000)
+        self.mock_redis.delete.assert_not_called()
+
+        self.script.return_value = [1, 0]
+        with self.assertRaises(KeyError):
+            del self.cache['key']
+
+    def test_delete_wins_over_newer_version(self):
+        self.script.return_value = [1, 1]
+        del self.cache['key']
+        self.assertEqual(self.script.call_args.kwargs['args'][3], "delete")
+
+    def test_set_if_newer_requires_versioned(self):
+        with patch('redis.StrictRedis'):
+            cache = RedisCache()
+        self.assertFalse(cache.versioned)
+        with self.assertRaises(TypeError):
+            cache.set_if_newer('key', 'value')
+
+
+@unittest.skipUnless(importlib.util.find_spec('fakeredis') and importlib.util.find_spec('lupa'),
+                     "fakeredis[lua] is required to run the versioning script")
+class TestRedisCacheVersionedScript(unittest.TestCase):
+
+    def setUp(self):
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        with patch('redis.StrictRedis', lambda **kwargs: fakeredis.FakeStrictRedis(server=server, **kwargs)):
+            self.cache = RedisCache(ttl=10, versioned=True, tombstone_ttl=30)
+
+    def test_set_if_newer(self):
+        self.assertTrue(self.cache.set_if_newer('key', 'old', version=1))
+        self.assertTrue(self.cache.set_if_newer('key', 'new', version=2))
+        self.assertFalse(self.cache.set_if_newer('key', 'stale', version=1))
+        self.assertEqual(self.cache.get_versioned('key'), ('new', 2))
+
+    def test_delete_blocks_older_writes(self):
+        self.cache['key'] = 'value'
+        started = time.time_ns()
+        del self.cache['key']
+        self.assertFalse(self.cache.set_if_newer('key', 'stale', version=started))
+        with self.assertRaises(KeyError):
+            _ = self.cache['key']
+        with self.assertRaises(KeyError):
+            del self.cache['key']
+
+    def test_delete_wins_over_newer_version(self):
+        future = time.time_ns() + 10 ** 12  # Written by a host whose clock runs ahead
+        self.cache.set_if_newer('key', 'future', version=future)
+        del self.cache['key']
+        with self.assertRaises(KeyError):
+            _ = self.cache['key']
+        self.assertFalse(self.cache.set_if_newer('key', 'future', version=future))
+        self.assertEqual(self.cache._redis.get('key'), f"{future + 1:020d}!")
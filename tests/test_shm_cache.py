@@ -0,0 +1,171 @@
+import multiprocessing
+import time
+
+import pytest
+from cachetools import LRUCache
+
+from rediscache_cachetools.cached import Cached
+from rediscache_cachetools.chain_cache import ChainCache
+from rediscache_cachetools.shm_cache import SharedMemoryCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shm-cache")
+
+
+@pytest.fixture
+def cache(path):
+    cache = SharedMemoryCache(path=path, sets=16, ways=4, slot_size=256, ttl=10, stripes=4)
+    yield cache
+    cache.close()
+
+
+def _child_set(path, key, value):
+    cache = SharedMemoryCache(path=path, sets=16, ways=4, slot_size=256, ttl=10, stripes=4)
+    cache[key] = value
+    cache.close()
+
+
+def test_set_and_get_item(cache):
+    cache["key1"] = {"foo": [1, 2]}
+    cache[b"key2"] = b"bytes"
+    cache[("tuple", 3)] = 3
+    assert cache["key1"] == {"foo": [1, 2]}
+    assert cache[b"key2"] == b"bytes"
+    assert cache[("tuple", 3)] == 3
+
+
+def test_get_missing_key(cache):
+    with pytest.raises(KeyError):
+        _ = cache["missing_key"]
+
+
+def test_delete_item(cache):
+    cache["key1"] = "value1"
+    del cache["key1"]
+    with pytest.raises(KeyError):
+        _ = cache["key1"]
+    with pytest.raises(KeyError):
+        del cache["key1"]
+
+
+def test_overwrite(cache):
+    cache["key1"] = "value1"
+    cache["key1"] = "value2"
+    assert cache["key1"] == "value2"
+    assert len(cache) == 1
+
+
+def test_ttl_expiry(path):
+    cache = SharedMemoryCache(path=path, sets=4, ways=2, slot_size=128, ttl=0.05, stripes=2)
+    cache["key1"] = "value1"
+    time.sleep(0.1)
+    with pytest.raises(KeyError):
+        _ = cache["key1"]
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_tuple_keys_round_trip(cache):
+    cache[("tuple", (1, 2))] = 3
+    assert list(cache) == [("tuple", (1, 2))]
+    assert dict(cache) == {("tuple", (1, 2)): 3}
+
+
+def test_unencodable_key(cache):
+    with pytest.raises(TypeError, match="JSON-encodable"):
+        cache[object()] = 1
+    with pytest.raises(TypeError, match="JSON-encodable"):
+        _ = cache[frozenset()]
+
+
+def test_value_too_large(cache):
+    with pytest.raises(ValueError):
+        cache["key1"] = "x" * 1024
+
+
+def test_set_eviction(path):
+    cache = SharedMemoryCache(path=path, sets=1, ways=2, slot_size=128, ttl=10, stripes=1)
+    for i in range(5):
+        cache[f"key{i}"] = i
+    assert len(cache) == 2
+    assert cache["key4"] == 4
+    cache.close()
+
+
+def test_iter_and_clear(cache):
+    cache["key1"] = "value1"
+    cache["key2"] = "value2"
+    assert set(cache) == {"key1", "key2"}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_layout_mismatch(cache, path):
+    with pytest.raises(ValueError):
+        SharedMemoryCache(path=path, sets=32, ways=4, slot_size=256)
+
+
+def test_shared_across_processes(cache, path):
+    process = multiprocessing.get_context("fork").Process(target=_child_set, args=(path, "shared", [1, 2, 3]))
+    process.start()
+    process.join()
+    assert cache["shared"] == [1, 2, 3]
+
+
+def test_stats(cache):
+    cache["key1"] = "value1"
+    _ = cache["key1"]
+    with pytest.raises(KeyError):
+        _ = cache["missing_key"]
+    assert cache.stats() == {'keys': 1, 'hits': 1, 'misses': 1}
+    assert cache.hits() == 0.5
+
+
+def test_chain_cache_l1(cache):
+    l2 = LRUCache(maxsize=10)
+    chain = ChainCache(cache, l2)
+    l2["key1"] = "value1"
+    assert chain["key1"] == "value1"
+    assert cache["key1"] == "value1"
+
+
+def test_chain_cache_skips_values_larger_than_a_slot(cache):
+    l2 = LRUCache(maxsize=10)
+    chain = ChainCache(cache, l2)
+    large = "x" * 1024
+    chain["key1"] = "small"
+    chain["key1"] = large
+    assert l2["key1"] == large
+    assert "key1" not in cache
+    assert chain["key1"] == large
+
+    l2["key2"] = large
+    assert chain["key2"] == large
+
+
+def test_cached_over_chain_stores_values_larger_than_a_slot(cache):
+    l2 = LRUCache(maxsize=10)
+    calls = []
+
+    @Cached(cache=ChainCache(cache, l2))
+    def render(n):
+        calls.append(n)
+        return "x" * n
+
+    assert render(1024) == render(1024)
+    assert calls == [1024]
+
+
+def test_instances_in_one_process_share_the_table(cache, path):
+    other = SharedMemoryCache(path=path, sets=16, ways=4, slot_size=256, ttl=10, stripes=4)
+    assert other._thread_locks is cache._thread_locks
+    other["key1"] = "value1"
+    other.close()
+    other.close()  # Closing twice is harmless
+
+    # The first instance keeps its mapping and locks
+    assert cache["key1"] == "value1"
+    cache["key2"] = "value2"
+    assert cache["key2"] == "value2"